@@ -0,0 +1,144 @@
+"""Offline benchmarks for WebsiteDriver and the handlers against local copies of each page type.
+
+Serves benchmarks/fixtures with http.server, runs each section in headless Chrome and
+reports wall time, WebDriver round trips and time spent sleeping per section type
+(the run-level round-trip table per handler method is printed when the driver closes).
+Run from the project root:
+
+    python -m benchmarks.run_benchmarks [--repeat N] [--json results.json]
+"""
+import argparse
+import functools
+import http.server
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from website_driver import WebsiteDriver
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# (section type, fixture page, what to run once the page is loaded)
+SECTIONS = [
+    ("quiz intro", "quiz.html", lambda w: w._go_through_each_course()),
+    ("quiz slides", "quiz.html?state=slides", lambda w: w.quiz_handler._answer_all_questions()),
+    ("quiz review", "quiz.html?state=review", lambda w: w.quiz_handler._scrape_quiz_questions()),
+    ("activity", "activity.html", lambda w: w._go_through_each_course()),
+    ("fill-gap", "fill_gap.html", lambda w: w._go_through_each_course()),
+    ("walkthrough question", "walkthrough_question.html", lambda w: w._go_through_each_course()),
+    ("lesson", "lesson.html", lambda w: w._go_through_each_course()),
+    ("infographic", "infographic.html", lambda w: w._go_through_each_course()),
+]
+
+
+class SleepMeter:
+    """Splits time.sleep on the main thread into fixed sleeps and WebDriverWait polling"""
+
+    def __init__(self):
+        self.fixed = 0.0
+        self.polling = 0.0
+        self._sleep = time.sleep
+
+    def install(self):
+        time.sleep = self._counted
+
+    def uninstall(self):
+        time.sleep = self._sleep
+
+    def reset(self):
+        self.fixed = 0.0
+        self.polling = 0.0
+
+    def _counted(self, seconds):
+        if threading.current_thread() is threading.main_thread():
+            caller = sys._getframe(1).f_globals.get('__name__', '')
+            if caller.startswith('selenium'):
+                self.polling += seconds
+            else:
+                self.fixed += seconds
+        self._sleep(seconds)
+
+
+def serve_fixtures():
+    """Serve the fixtures directory on a free local port, returns the server"""
+    handler = functools.partial(QuietHandler, directory=FIXTURES_DIR)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def run(repeat):
+    server = serve_fixtures()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    results = []
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        w_driver = WebsiteDriver("benchmark", "benchmark", lean=True, data_dir=data_dir,
+                                 resume_checkpoint=False, next_timeout=10, instrument=True)
+        stats = w_driver.command_stats
+        sleeps = SleepMeter()
+        sleeps.install()
+        try:
+            for section_type, page, run_section in SECTIONS:
+                for _ in range(repeat):
+                    w_driver.driver.get(base_url + page)
+                    calls_before = stats.calls
+                    sleeps.reset()
+                    start = time.monotonic()
+                    run_section(w_driver)
+                    results.append({
+                        "section": section_type,
+                        "wall": time.monotonic() - start,
+                        "round_trips": stats.calls - calls_before,
+                        "sleep": sleeps.fixed,
+                        "wait_polling": sleeps.polling
+                    })
+        finally:
+            sleeps.uninstall()
+            w_driver._close()
+            server.shutdown()
+
+    return results
+
+
+def summarize(results):
+    """Average the results per section type"""
+    summary = {}
+    for result in results:
+        totals = summary.setdefault(result["section"], Counter())
+        totals["runs"] += 1
+        for key in ("wall", "round_trips", "sleep", "wait_polling"):
+            totals[key] += result[key]
+    return {section: {key: value / totals["runs"] for key, value in totals.items() if key != "runs"}
+            for section, totals in summary.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the driver against local fixtures')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per section type')
+    parser.add_argument('--json', help='Also write the raw per-run results to this file')
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+
+    print(f"\n{'Section':<22} {'Wall (s)':>9} {'Round trips':>12} {'Sleep (s)':>10} {'Wait poll (s)':>14}")
+    for section, averages in summarize(results).items():
+        print(f"{section:<22} {averages['wall']:>9.2f} {averages['round_trips']:>12.0f} "
+              f"{averages['sleep']:>10.2f} {averages['wait_polling']:>14.2f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,63 @@
 import random
 from selenium.webdriver.common.by import By
 from .base_handler import BaseHandler
+from utils import ActivityQuestionRecord, ReviewOption, WalkthroughRecord, option_status, traced
+
+
+# Walks the reviewed activity in the page and returns every question with its options
+# (text and class) and explanation, so the review costs one WebDriver round trip.
+_REVIEW_ACTIVITY_SCRIPT = """
+const text = (el) => el ? el.innerText.trim() : '';
+const readOptions = (scope, selector) => Array.from(scope.querySelectorAll(selector))
+    .filter((option) => option.querySelector('span.option-content'))
+    .map((option) => ({
+        text: text(option.querySelector('span.option-content')),
+        class: option.getAttribute('class') || ''
+    }));
+
+const container = document.querySelector('div.questions');
+if (container) {
+    const questions = [];
+    const children = Array.from(container.children);
+    children.forEach((element, i) => {
+        const cls = element.getAttribute('class') || '';
+        if (!cls.includes('question') || cls.includes('question-message')) {
+            return;
+        }
+        let explanation = null;
+        const next = children[i + 1];
+        if (next && (next.getAttribute('class') || '').includes('question-message')) {
+            const feedback = next.querySelector('p.feedback-container');
+            explanation = feedback ? text(feedback) : null;
+        }
+        questions.push({
+            text: text(element.querySelector('p')),
+            options: readOptions(element, 'div.option'),
+            explanation: explanation
+        });
+    });
+    return {structure: 'standard', questions: questions};
+}
+
+return {
+    structure: 'fill-gap',
+    questions: Array.from(document.querySelectorAll('div.fill-gap-question')).map((fillGap) => ({
+        text: text(fillGap.querySelector('div.question')),
+        options: readOptions(fillGap, 'div.options > div.option'),
+        explanation: null
+    }))
+};
+"""
 
 
 class ActivityHandler(BaseHandler):
 
+    @traced('handler')
     def handle(self, is_acitivity=True):
         """Handle activity page"""
+        if self._is_archived("activities" if is_acitivity else "walkthroughs"):
+            return
+
         # Try to make selections, if it fails go straight to review
         try:
             self._make_selections()
@@ -16,20 +67,21 @@ class ActivityHandler(BaseHandler):
             print(f"Could not make selections (possibly already submitted): {e}")
 
         if is_acitivity:
-            scraped_content = self._review_activity_answers()
-            self._save_activity(scraped_content)
+            questions = self._review_activity_answers()
+            self._save_activity(questions)
         else:
-            scraped_content = self._review_walkthrough_answers()
-            self._save_walkthrough(scraped_content)
+            walkthrough = self._review_walkthrough_answers()
+            self._save_walkthrough(walkthrough)
     
-    def _save_activity(self, content):
+    def _save_activity(self, questions):
         """Save activity content"""
-        self._save_content(content, "activities")
+        self._save_document("activities", questions)
 
-    def _save_walkthrough(self, content):
+    def _save_walkthrough(self, walkthrough):
         """Save walkthrough content"""
-        self._save_content(content, "walkthroughs")
+        self._save_document("walkthroughs", [walkthrough])
 
+    @traced('handler')
     def _make_selections(self):
         """Randomly select an answer for a given question element"""
         questions = self.driver.find_elements(By.CSS_SELECTOR, 'div.question')
@@ -59,6 +111,7 @@ class ActivityHandler(BaseHandler):
 
             print(f"Question {idx}: No selectable elements found")
                 
+    @traced('handler')
     def _submit_activity(self):
         """Submit the activity and wait for page to load"""
         # Find submit button and click using JavaScript to avoid overlay issues
@@ -66,160 +119,54 @@ class ActivityHandler(BaseHandler):
         self.driver.execute_script("arguments[0].click();", submit_button)
         print("Clicked Submit button")
 
-        # Wait for page to load (document ready state)
-        self.wait.until(lambda driver: driver.execute_script('return document.readyState') == 'complete')
+        # The submission is posted in place, so wait for its requests to finish rather than readyState
+        if self.readiness:
+            self.readiness.wait_until_ready(self.driver)
+        else:
+            self.wait.until(lambda driver: driver.execute_script('return document.readyState') == 'complete')
         print("New page loaded after submission") 
         
     def _review_walkthrough_answers(self):
-        """Review walkthrough answers and format as markdown"""
+        """Review walkthrough answers and collect its transcript into a WalkthroughRecord"""
         # Get the question/answer content
-        question_content = self._review_activity_answers()
-        markdown_content = "# Walkthrough Review\n\n"
-        markdown_content += "## Walkthrough Question\n\n"
-        markdown_content += question_content
+        questions = self._review_activity_answers()
 
         # Get the transcript content
-        
-        markdown_content += "## Educational Content\n\n"
-
+        texts = []
         try:
             transcript_container = self.driver.find_element(By.CSS_SELECTOR, 'div.transcript')
             paragraphs = transcript_container.find_elements(By.TAG_NAME, 'p')
 
-            for p in paragraphs:
-                if p.text.strip():
-                    markdown_content += f"{p.text}\n\n"
+            texts = [p.text for p in paragraphs]
+            texts = [text for text in texts if text.strip()]
         except Exception as e:
             print(f"Could not find transcript: {e}")
 
-        markdown_content += "---\n\n"
-
-        return markdown_content
+        return WalkthroughRecord(questions, texts)
     
+    @traced('handler')
     def _review_activity_answers(self):
-        """Review answers and format as markdown"""
+        """Review answers into ActivityQuestionRecords"""
         from selenium.webdriver.support import expected_conditions as EC
-        from selenium.common.exceptions import StaleElementReferenceException
-
-        markdown_content = "# Activity Review\n\n"
 
-        # Try standard structure first
+        # Wait for either the standard or the fill-gap structure to render
         try:
-            questions_container = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'div.questions'))
+            self.wait.until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, 'div.questions, div.fill-gap-question'))
             )
-
-            question_num = 0
-            i = 0
-
-            # Get initial count
-            all_children = questions_container.find_elements(By.XPATH, './child::*')
-            total_children = len(all_children)
-
-            while i < total_children:
-                try:
-                    # Re-fetch elements to avoid stale references
-                    all_children = questions_container.find_elements(By.XPATH, './child::*')
-                    element = all_children[i]
-
-                    # Check if this is a question div
-                    element_class = element.get_attribute('class')
-                    if 'question' in element_class and 'question-message' not in element_class:
-                        question_num += 1
-
-                        # Get question text
-                        question_text = element.find_element(By.CSS_SELECTOR, 'p').text
-
-                        # Get all options
-                        options = element.find_elements(By.CSS_SELECTOR, 'div.option')
-
-                        markdown_content += f"## Question {question_num}\n\n"
-                        markdown_content += f"**{question_text}**\n\n"
-                        markdown_content += "### Options:\n\n"
-
-                        for option in options:
-                            try:
-                                option_text_elem = option.find_element(By.CSS_SELECTOR, 'span.option-content')
-                                option_text = option_text_elem.text
-                                option_class = option.get_attribute('class')
-
-                                # Check if this was the correct answer
-                                if 'correct-feedback' in option_class or 'reveal-correct-feedback' in option_class:
-                                    markdown_content += f"- **{option_text}** ✓ (Correct)\n"
-                                # Check if this was the user's incorrect answer
-                                elif 'incorrect-feedback' in option_class:
-                                    markdown_content += f"- {option_text} ✗ (Your answer - Incorrect)\n"
-                                else:
-                                    markdown_content += f"- {option_text}\n"
-                            except:
-                                pass
-
-                        # Check if next sibling is the explanation
-                        if i + 1 < total_children:
-                            try:
-                                all_children = questions_container.find_elements(By.XPATH, './child::*')
-                                if i + 1 < len(all_children):  # Double-check bounds after refetch
-                                    next_element = all_children[i + 1]
-                                    next_class = next_element.get_attribute('class')
-                                    if 'question-message' in next_class:
-                                        explanation = next_element.find_element(By.CSS_SELECTOR, 'p.feedback-container')
-                                        markdown_content += f"\n**Explanation:** {explanation.text}\n\n"
-                            except:
-                                pass
-
-                        markdown_content += "---\n\n"
-
-                except StaleElementReferenceException:
-                    print(f"Stale element at index {i}, retrying...")
-                    continue
-
-                i += 1
-
-            return markdown_content
-
-        except Exception as e:
-            print(f"Standard structure not found: {e}")
-            print("Trying fill-gap structure...")
-
-        # Try fill-gap structure
-        try:
-            fill_gap_questions = self.driver.find_elements(By.CSS_SELECTOR, 'div.fill-gap-question')
-            print(f"Found {len(fill_gap_questions)} fill-gap questions")
-
-            for question_num, fill_gap in enumerate(fill_gap_questions, 1):
-                # Get question text directly from div.question
-                question_div = fill_gap.find_element(By.CSS_SELECTOR, 'div.question')
-                question_text = question_div.text.strip()
-
-                markdown_content += f"## Question {question_num}\n\n"
-                markdown_content += f"**{question_text}**\n\n"
-                markdown_content += "### Options:\n\n"
-
-                # Get all options from div.options
-                options = fill_gap.find_elements(By.CSS_SELECTOR, 'div.options > div.option')
-
-                for option in options:
-                    try:
-                        # Get option text from span.option-content
-                        option_text_elem = option.find_element(By.CSS_SELECTOR, 'span.option-content')
-                        option_text = option_text_elem.text
-                        option_class = option.get_attribute('class')
-
-                        # Check if this was the correct answer
-                        if 'correct-feedback' in option_class or 'reveal-correct-feedback' in option_class:
-                            markdown_content += f"- **{option_text}** ✓ (Correct)\n"
-                        # Check if this was the user's incorrect answer
-                        elif 'incorrect-feedback' in option_class:
-                            markdown_content += f"- {option_text} ✗ (Your answer - Incorrect)\n"
-                        else:
-                            markdown_content += f"- {option_text}\n"
-                    except Exception as opt_error:
-                        print(f"Error parsing option: {opt_error}")
-
-                markdown_content += "---\n\n"
-
-            return markdown_content
-
         except Exception as e:
-            print(f"Fill-gap structure also failed: {e}")
-            return markdown_content
\ No newline at end of file
+            print(f"No review questions found: {e}")
+            return []
+
+        # Pull every question, option and explanation in a single round trip
+        payload = self.driver.execute_script(_REVIEW_ACTIVITY_SCRIPT)
+        print(f"Found {len(payload['questions'])} {payload['structure']} questions")
+
+        return [
+            ActivityQuestionRecord(
+                question['text'],
+                [ReviewOption(option['text'], option_status(option['class'])) for option in question['options']],
+                question['explanation']
+            )
+            for question in payload['questions']
+        ]
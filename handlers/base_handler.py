@@ -1,15 +1,34 @@
 import os
+import time
 from selenium.webdriver.common.by import By
+from utils import NULL_TRACER, Document, file_numberer, write_file_atomic, content_hash, render_markdown, traced
 
 
 class BaseHandler:
     """Base handler class with common functionality for all handlers"""
 
-    def __init__(self, driver, wait):
+    def __init__(self, driver, wait, output_dir=None):
         self.driver = driver
         self.wait = wait
-        # Get project root directory (one level up from handlers/)
-        self.script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        # Optional BackgroundWriter; when set, saves are queued instead of written inline
+        self.writer = None
+        # Optional ContentManifest recording what has been archived
+        self.manifest = None
+        # Skip sections whose URL is already in the manifest before scraping them
+        self.skip_archived = False
+        # Tracer for phase spans, a no-op unless tracing is on
+        self.tracer = NULL_TRACER
+        # Optional PageReadiness used to wait for in-place page updates to settle
+        self.readiness = None
+        # Optional SearchJournal told about every saved file so the search index can catch up
+        self.search_journal = None
+        # Seconds a handler loop (answering or reviewing a quiz) may run before giving up, None for no limit
+        self.phase_budget = None
+        # Count of things done on the page (files saved, questions answered, slides advanced),
+        # so a revisited URL that still got work done isn't mistaken for a stall
+        self.progress = 0
+        # Get project root directory (one level up from handlers/), content/ is written under it
+        self.script_dir = output_dir or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
     def _get_chapter_text(self):
         """Extract and sanitize chapter text"""
@@ -33,42 +52,66 @@ class BaseHandler:
         except:
             return None
 
-    def _create_directory_path(self, content_type):
+    def _deadline(self):
+        """Monotonic time the current phase's loop should stop at, or None without a budget"""
+        return time.monotonic() + self.phase_budget if self.phase_budget else None
+
+    def _out_of_time(self, deadline, phase):
+        """Whether deadline has passed, printing why the phase stops"""
+        if deadline is not None and time.monotonic() > deadline:
+            print(f"{phase} exceeded its {self.phase_budget}s budget, stopping")
+            return True
+        return False
+
+    def _create_directory_path(self, content_type, create=True, chapter_text=None):
         """Create and return directory path: content/{chapter}/{content_type}/"""
-        chapter_text = self._get_chapter_text()
+        if chapter_text is None:
+            chapter_text = self._get_chapter_text()
 
         if chapter_text:
             directory = os.path.join(self.script_dir, "content", chapter_text, content_type)
         else:
             directory = os.path.join(self.script_dir, "content", content_type)
 
-        os.makedirs(directory, exist_ok=True)
+        if create:
+            os.makedirs(directory, exist_ok=True)
         return directory
 
     def _get_next_file_number(self, directory):
         """Get the next file number for the directory"""
-        if not os.path.exists(directory):
-            return 1
-
-        # Get all files in directory and extract numbers
-        files = os.listdir(directory)
-        numbers = []
-        for f in files:
-            # Extract number from filename like "1_filename.md"
-            if '_' in f:
-                try:
-                    num = int(f.split('_')[0])
-                    numbers.append(num)
-                except ValueError:
-                    pass
-
-        # Return next number
-        return max(numbers) + 1 if numbers else 1
-
-    def _save_content(self, content, content_type, extension="md"):
+        return file_numberer.next_number(directory)
+
+    def _is_archived(self, content_type):
+        """Check the manifest for an existing archive of the current page"""
+        if not self.manifest or not self.skip_archived:
+            return False
+        entry = self.manifest.find(self.driver.current_url, content_type)
+        if entry:
+            print(f"Already archived {content_type} at {entry['output_path']}, skipping")
+            return True
+        return False
+
+    def _save_document(self, content_type, records):
+        """Save records as markdown, with a JSONL copy of the records next to it for re-rendering"""
+        document = Document(content_type, records)
+        return self._save_content(render_markdown(document), content_type, document=document)
+
+    @traced('save')
+    def _save_content(self, content, content_type, extension="md", document=None):
         """Save content to chapter/content_type directory structure with numbered prefix"""
         lesson_text = self._get_lesson_text()
-        directory = self._create_directory_path(content_type)
+        chapter_text = self._get_chapter_text()
+
+        # Skip re-writing content that is already archived unchanged
+        digest = content_hash(content)
+        if self.manifest:
+            duplicate = self.manifest.find_duplicate(chapter_text, lesson_text, content_type, digest)
+            if duplicate:
+                print(f"Unchanged {content_type} already saved to: {duplicate['output_path']}")
+                return duplicate['output_path']
+
+        # The background writer creates the directory itself
+        directory = self._create_directory_path(content_type, create=self.writer is None, chapter_text=chapter_text or '')
 
         # Get next file number
         file_number = self._get_next_file_number(directory)
@@ -80,9 +123,34 @@ class BaseHandler:
             filename = f"{file_number}_{content_type}.{extension}"
 
         filepath = os.path.join(directory, filename)
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(content)
+        files = [(filepath, content)]
+        url = self.driver.current_url
+
+        if document is not None:
+            document.chapter, document.lesson, document.url = chapter_text, lesson_text, url
+            files.append((os.path.splitext(filepath)[0] + ".jsonl", document.to_jsonl()))
+
+        def on_written(path):
+            file_numberer.mark_written(directory)
+            # Only recorded once the file is on disk, so a crash can't leave rows for unwritten files
+            if self.manifest and path == filepath:
+                self.manifest.record(chapter_text, lesson_text, content_type, digest, url, filepath)
+
+        if self.writer:
+            for path, data in files:
+                self.writer.write(path, data, on_written=lambda path=path: on_written(path))
+            print(f"Queued {content_type} for: {filepath}")
+            self.progress += 1
+            if self.search_journal:
+                self.search_journal.add(filepath)
+            return filepath
+
+        for path, data in files:
+            write_file_atomic(path, data)
+            on_written(path)
+        self.progress += 1
+        if self.search_journal:
+            self.search_journal.add(filepath)
 
         print(f"Saved {content_type} to: {filepath}")
         return filepath
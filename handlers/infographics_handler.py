@@ -1,42 +1,47 @@
 import os
-import time
 from selenium.webdriver.common.by import By
 from .base_handler import BaseHandler
+from utils import file_numberer, file_hash, traced
 
 
 class InfographicsHandler(BaseHandler):
-    def __init__(self, driver, wait, download_dir):
-        super().__init__(driver, wait)
+    def __init__(self, driver, wait, download_dir, downloads, output_dir=None):
+        super().__init__(driver, wait, output_dir)
         self.temp_download_dir = download_dir
+        # DownloadTracker that finishes downloads in the background
+        self.downloads = downloads
 
+    @traced('handler')
     def handle(self):
         """Handle infographics page - download PDF"""
+        if self._is_archived("infographics"):
+            return
+
         # Click the download button
         download_button = self.driver.find_element(
             By.CSS_SELECTOR,
             'button[data-testid="get-file__download-button"]'
         )
+        self.downloads.discard_events(self.driver)
+        before = set(os.listdir(self.temp_download_dir))
         download_button.click()
 
-        # Wait for download to complete
-        self._wait_for_download()
+        # Wait only for the download to start, it finishes in the background
+        guid = self._wait_for_download(before)
+        if not guid:
+            print("No download started")
+            return
 
-        # Move and rename the downloaded file
-        self._move_and_rename_download()
+        # Move and rename the downloaded file once it completes
+        self._move_and_rename_download(guid)
 
-    def _move_and_rename_download(self):
-        """Move downloaded file to chapter/lesson directory structure"""
+    @traced('handler')
+    def _move_and_rename_download(self, guid):
+        """Queue the download to be moved to the chapter/lesson directory structure"""
         lesson_text = self._get_lesson_text()
-        directory = self._create_directory_path("infographics")
-
-        # Get the latest downloaded file from temp directory
-        files = os.listdir(self.temp_download_dir)
-        paths = [os.path.join(self.temp_download_dir, f) for f in files if not f.endswith('.crdownload')]
-        if not paths:
-            print("No downloaded file found")
-            return
-
-        latest_file = max(paths, key=os.path.getctime)
+        chapter_text = self._get_chapter_text()
+        source_url = self.driver.current_url
+        directory = self._create_directory_path("infographics", chapter_text=chapter_text or '')
 
         # Get next file number
         file_number = self._get_next_file_number(directory)
@@ -49,18 +54,17 @@ class InfographicsHandler(BaseHandler):
 
         new_filepath = os.path.join(directory, filename)
 
-        # Move and rename
-        os.rename(latest_file, new_filepath)
-        print(f"Saved infographic to: {new_filepath}")
-    
-    def _wait_for_download(self, timeout=30):
-        """Wait for download to complete"""
-        seconds = 0
-        while seconds < timeout:
-            time.sleep(1)
-            # Check if there are any .crdownload files (Chrome's temporary download files)
-            downloading = [f for f in os.listdir(self.temp_download_dir) if f.endswith('.crdownload')]
-            if not downloading:
-                return True
-            seconds += 1
-        return False
+        def on_done(filepath):
+            file_numberer.mark_written(directory)
+            if self.manifest:
+                self.manifest.record(chapter_text, lesson_text, "infographics", file_hash(filepath),
+                                     source_url, filepath)
+
+        self.downloads.finish_in_background(guid, new_filepath, on_done)
+        self.progress += 1
+        print(f"Infographic will be saved to: {new_filepath}")
+
+    @traced('handler')
+    def _wait_for_download(self, before, timeout=10):
+        """Wait for the download to start and return its GUID"""
+        return self.downloads.wait_for_start(self.driver, before, timeout)
@@ -1,29 +1,32 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from .base_handler import BaseHandler
+from utils import LessonRecord, traced
 
 
 class LessonHandler(BaseHandler):
 
+    @traced('handler')
     def handle(self):
         """Handle lesson page and scrape educational content"""
-        markdown_content = self._scrape_educational_content()
-        self._save_lesson(markdown_content)
+        if self._is_archived("lessons"):
+            return
+        lesson = self._scrape_educational_content()
+        self._save_lesson(lesson)
 
-    def _save_lesson(self, content):
+    def _save_lesson(self, lesson):
         """Save lesson content"""
-        self._save_content(content, "lessons")
+        self._save_document("lessons", [lesson])
 
+    @traced('handler')
     def _scrape_educational_content(self):
-        """Scrape lesson content and format as markdown"""
-        markdown_content = "# Lesson\n\n"
-
+        """Scrape lesson title and transcript into a LessonRecord"""
         # Get lesson title if available
         try:
             lesson_element = self.driver.find_element(By.CSS_SELECTOR, 'div.page-header-lesson.header-text')
-            markdown_content += f"## {lesson_element.text}\n\n"
+            title = lesson_element.text
         except:
-            pass
+            title = None
 
         # Try to find transcript div
         try:
@@ -34,16 +37,14 @@ class LessonHandler(BaseHandler):
             # Get all <p> tags within the transcript div
             paragraphs = transcript_div.find_elements(By.TAG_NAME, 'p')
 
-            # Add paragraphs
-            for p in paragraphs:
-                if p.text.strip():
-                    markdown_content += f"{p.text}\n\n"
+            # Keep non-empty paragraphs
+            texts = [p.text for p in paragraphs]
+            texts = [text for text in texts if text.strip()]
 
             print(f"Scraped {len(paragraphs)} paragraphs from transcript")
-            return markdown_content
+            return LessonRecord(title, texts)
 
         except Exception as e:
             print(f"No transcript div found: {e}")
             print("Lesson may not have scrapable content, skipping...")
-            markdown_content += "_No content available_\n\n"
-            return markdown_content
+            return LessonRecord(title, None)
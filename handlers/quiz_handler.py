@@ -1,17 +1,63 @@
 import random
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import ElementNotInteractableException, NoSuchElementException, TimeoutException
 from .base_handler import BaseHandler
+from utils import QUIZ_BANK_FILENAME, QuizBankStore, QuizQuestionRecord, append_quiz_records, match_option, traced
+import os
 import time
 import re
 
 
+# Reads every rendered review question (label, option text/classes and feedback)
+# in one round trip. Works for both one-slide-at-a-time and all-at-once reviews.
+_REVIEW_SLIDES_SCRIPT = """
+const text = (el) => el ? el.innerText.trim() : '';
+return Array.from(document.querySelectorAll('div.question-wrap'))
+    .filter((wrap) => wrap.querySelector('label.pb-2.form-label'))
+    .map((wrap) => ({
+        question: text(wrap.querySelector('label.pb-2.form-label')),
+        options: Array.from(wrap.querySelectorAll('div.cards-quiz--option'))
+            .map((option) => ({
+                span: option.querySelector('div.option-content-wrapper > span'),
+                class: option.getAttribute('class') || ''
+            }))
+            .filter((option) => option.span)
+            .map((option) => ({text: text(option.span), class: option.class})),
+        feedback: text(wrap.querySelector('div.quiz-feedback'))
+    }));
+"""
+
+# Returns the option label text (first span only) for every radio in arguments[0], in order
+_OPTION_TEXTS_SCRIPT = """
+return Array.from(arguments[0].querySelectorAll('input[type="radio"]')).map((radio) => {
+    const label = arguments[0].querySelector(`label[for="${CSS.escape(radio.id)}"]`);
+    if (!label) {
+        return '';
+    }
+    const span = label.querySelector('div.option-content-wrapper > span');
+    return (span || label).innerText.trim();
+});
+"""
+
+# Returns the label of the question currently on screen, or null between slides
+_CURRENT_QUESTION_SCRIPT = """
+const label = document.querySelector('div.question-wrap label.pb-2.form-label');
+return label ? label.innerText.trim() : null;
+"""
+
+
 class QuizHandler(BaseHandler):
 
-    def __init__(self, driver, wait):
-        super().__init__(driver, wait)
-        self.quiz_bank = {}
+    def __init__(self, driver, wait, bank_path=None, output_dir=None):
+        super().__init__(driver, wait, output_dir)
+        if bank_path is None:
+            bank_path = os.path.join(self.script_dir, "saved", "quiz_bank.db")
+        # Persisted so restarts don't have to rebuild the bank through more quiz cycles
+        self.quiz_bank = QuizBankStore(bank_path)
+        self.scrape_times = []
 
+    @traced('handler')
     def handle(self):
         """Handle quiz page - start quiz and answer questions"""
         # Find and click the "Start new quiz" button
@@ -28,6 +74,7 @@ class QuizHandler(BaseHandler):
                     # Next button is enabled, click it
                     self._save_quiz_bank()
                     next_button.click()
+                    self.progress += 1
                     print("Clicked next button")
             except:
                 print("Next button not found, starting new quiz")
@@ -38,38 +85,35 @@ class QuizHandler(BaseHandler):
         except Exception as e:
             print(f"Error starting quiz: {e}")
     
+    @traced('handler')
     def _save_quiz_bank(self):
-        """Convert quiz_bank to markdown and save it"""
+        """Append questions that are new or changed since the last export to the chapter's quiz bank"""
         if not self.quiz_bank:
             print("Quiz bank is empty, nothing to save")
             return
 
-        markdown_content = "# Quiz Bank\n\n"
-
-        for idx, (question_text, data) in enumerate(self.quiz_bank.items(), 1):
-            markdown_content += f"## Question {idx}\n\n"
-            markdown_content += f"**Question:** {data['question']}\n\n"
-            markdown_content += "**Options:**\n"
-
-            # List all options with correct answer marked
-            for option_idx, option in enumerate(data['options']):
-                if option_idx == data['correct_index']:
-                    markdown_content += f"{option_idx + 1}. {option} ✓\n"
-                else:
-                    markdown_content += f"{option_idx + 1}. {option}\n"
-
-            markdown_content += f"\n**Correct Answer:** Option {data['correct_index'] + 1} - {data['correct_answer']}\n\n"
-
-            if data['feedback']:
-                markdown_content += f"**Feedback:** {data['feedback']}\n\n"
-
-            markdown_content += "---\n\n"
+        chapter_text = self._get_chapter_text()
+        pending = self.quiz_bank.unexported(chapter_text)
+        if not pending:
+            print("No new or changed quiz questions to export for this chapter")
+            return
 
-        # Save using base handler's _save_content method
-        self._save_content(markdown_content, "quiz")
-        print(f"Saved {len(self.quiz_bank)} questions to quiz bank")
+        records = [
+            QuizQuestionRecord(data['question'], data['options'], data['correct_answer'],
+                               data['correct_index'], data['feedback'])
+            for data in pending
+        ]
+        bank_path = os.path.join(self._create_directory_path("quiz", chapter_text=chapter_text or ''),
+                                 QUIZ_BANK_FILENAME)
+        append_quiz_records(bank_path, records)
+        self.quiz_bank.mark_exported(pending)
+        if self.search_journal:
+            self.search_journal.add(bank_path)
+        print(f"Exported {len(records)} new or changed questions to {bank_path} "
+              f"({len(self.quiz_bank)} in quiz bank)")
         
     
+    @traced('handler')
     def _attempt_quiz(self):
         """Attempt the quiz by selecting random answers for each question"""
         start_button = self.wait.until(
@@ -78,13 +122,15 @@ class QuizHandler(BaseHandler):
         start_button.click()
         print("Clicked 'Start new quiz' button")
         
-        time.sleep(2)  # Wait for quiz to load
+        # Wait for quiz to load (or for the secondary button shown before it)
+        self.wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, 'button.btn.btn-secondary, div.slide-container'))
+        )
         
         try:
             submit_button = self.driver.find_element(By.CSS_SELECTOR, 'button.btn.btn-secondary')
             if submit_button:
                 submit_button.click()
-                time.sleep(2)
         except:
             pass
             
@@ -97,6 +143,7 @@ class QuizHandler(BaseHandler):
         # Answer all questions
         self._answer_all_questions()
 
+    @traced('handler')
     def _review_quiz(self):
         """Review a failed quiz attempt"""
         try:
@@ -107,69 +154,39 @@ class QuizHandler(BaseHandler):
             review_button = quiz_attempt.find_element(By.CSS_SELECTOR, 'div.quiz-attempt-buttons-wrapper button.btn.btn-primary')
             review_button.click()
             print("Clicked Review button")
-            time.sleep(2)
             self._scrape_quiz_questions()
         except Exception as e:
             print(f"Error clicking Review button: {e}")
 
+    @traced('handler')
     def _scrape_quiz_questions(self):
         """Scrape all quiz questions, answers, and feedback"""
+        start = time.monotonic()
+        scraped = set()
+        deadline = self._deadline()
+        chapter_text = self._get_chapter_text()
         try:
+            # Wait for the first question-wrap div
+            self.wait.until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, 'div.question-wrap'))
+            )
+
             finished = False
-            while not finished:
-                # Find the current question-wrap div
-                question_wrap = self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, 'div.question-wrap'))
-                )
+            while not finished and not self._out_of_time(deadline, "Quiz review"):
+                # Read every question currently rendered in a single round trip
+                slides = self.driver.execute_script(_REVIEW_SLIDES_SCRIPT)
+                if not slides:
+                    # Caught between slides, wait for the next one to render instead of stopping
+                    self._wait_for_question_change(None)
+                    continue
+                for slide in slides:
+                    self._store_reviewed_question(slide, chapter_text)
+                    scraped.add(slide['question'])
+                    self.progress += 1
 
-                # Get question text and strip numbering (e.g., "1. ")
-                question_label = question_wrap.find_element(By.CSS_SELECTOR, 'label.pb-2.form-label')
-                full_question = question_label.text.strip()
-                question_text = re.sub(r'^\d+\.\s*', '', full_question)
-
-                # Get all options
-                option_divs = question_wrap.find_elements(By.CSS_SELECTOR, 'div.cards-quiz--option')
-                options = []
-                correct_answer = None
-                correct_index = None
-
-                for idx, option_div in enumerate(option_divs):
-                    # Get the option text (first span, not feedback-text)
-                    spans = option_div.find_elements(By.CSS_SELECTOR, 'div.option-content-wrapper > span')
-                    if spans:
-                        option_text = spans[0].text.strip()
-                        options.append(option_text)
-                        # Check if this is the correct answer (exclude incorrect-feedback)
-                        option_class = option_div.get_attribute('class')
-                        if ('reveal-correct-feedback' in option_class or 'correct-feedback' in option_class) and 'incorrect-feedback' not in option_class:
-                            print("correct answer seems to be ", option_text)
-                            correct_answer = option_text
-                            correct_index = idx
-
-                # Get feedback
-                try:
-                    feedback_div = question_wrap.find_element(By.CSS_SELECTOR, 'div.quiz-feedback')
-                    feedback = feedback_div.text.strip()
-                except:
-                    feedback = ""
-
-                # Store in quiz_bank
-                self.quiz_bank[question_text] = {
-                    "question": question_text,
-                    "options": options,
-                    "correct_answer": correct_answer,
-                    "correct_index": correct_index,
-                    "feedback": feedback
-                }
-                print(f"Scraped question: {question_text[:50]}...")
-                
-                
                 print(f"Total questions in bank: {len(self.quiz_bank)}")
-                try:
-                    next_button = self.driver.find_element(By.CSS_SELECTOR, 'div.lesson-button--next:not(.lesson-button--disabled)')
-                    next_button.click()
-                    time.sleep(2)  # Wait for next question to load
-                except:
+                # A review that renders every question at once has nothing left to page through
+                if len(slides) > 1 or not self._advance_review(slides[0]['question']):
                     leave_button = self.driver.find_element(By.CSS_SELECTOR, 'div.bd')
                     leave_button.click()
                     finished = True
@@ -177,13 +194,69 @@ class QuizHandler(BaseHandler):
                 
         except Exception as e:
             print(f"Error scraping quiz questions: {e}")
+        finally:
+            elapsed = time.monotonic() - start
+            self.scrape_times.append(elapsed)
+            print(f"Scraped {len(scraped)} review questions in {elapsed:.2f}s")
+
+    def _store_reviewed_question(self, slide, chapter_text):
+        """Store a reviewed question payload in the quiz bank, tagged with the chapter it belongs to"""
+        # Strip numbering (e.g., "1. ") from the question label
+        question_text = re.sub(r'^\d+\.\s*', '', slide['question'])
+
+        options = []
+        correct_answer = None
+        correct_index = None
+        for idx, option in enumerate(slide['options']):
+            options.append(option['text'])
+            # Check if this is the correct answer (exclude incorrect-feedback)
+            option_class = option['class']
+            if ('reveal-correct-feedback' in option_class or 'correct-feedback' in option_class) and 'incorrect-feedback' not in option_class:
+                print("correct answer seems to be ", option['text'])
+                correct_answer = option['text']
+                correct_index = idx
+
+        self.quiz_bank[question_text] = {
+            "question": question_text,
+            "options": options,
+            "correct_answer": correct_answer,
+            "correct_index": correct_index,
+            "feedback": slide['feedback'],
+            # Exports go to the chapter whose quiz the question was reviewed in
+            "chapter": chapter_text
+        }
+        print(f"Scraped question: {question_text[:50]}...")
+
+    def _advance_review(self, current_label):
+        """Click the next review slide and wait for it to render, returns False on the last slide"""
+        try:
+            next_button = self.driver.find_element(By.CSS_SELECTOR, 'div.lesson-button--next:not(.lesson-button--disabled)')
+            next_button.click()
+        except (NoSuchElementException, ElementNotInteractableException):
+            return False
+        try:
+            self._wait_for_question_change(current_label)
+        except TimeoutException:
+            # The caller re-reads whatever is on screen and tries again
+            print("Next review slide didn't render in time, re-reading the current slide")
+        return True
+
+    def _wait_for_question_change(self, previous_label):
+        """Wait until a slide whose question label differs from previous_label has rendered"""
+        def changed(driver):
+            # null means the old slide is gone but the next one hasn't rendered yet
+            label = driver.execute_script(_CURRENT_QUESTION_SCRIPT)
+            return label is not None and label != previous_label
+        self.wait.until(changed)
     
     
+    @traced('handler')
     def _answer_all_questions(self):
         """Go through all quiz questions and answer using quiz bank or randomly"""
         question_count = 0
         reached_end = False
-        while not reached_end:
+        deadline = self._deadline()
+        while not reached_end and not self._out_of_time(deadline, "Quiz attempt"):
             try:
                 # Wait for question to load
                 quiz_card = self.wait.until(
@@ -197,6 +270,7 @@ class QuizHandler(BaseHandler):
                     full_question = question_label.text.strip()
                     question_text = re.sub(r'^\d+\.\s*', '', full_question)
                 except:
+                    full_question = None
                     question_text = None
 
                 # Find all radio options within the current question wrap only
@@ -205,39 +279,23 @@ class QuizHandler(BaseHandler):
                 if radio_inputs:
                     selected_option = None
 
-                    # Check if question is in quiz bank
-                    if question_text and question_text in self.quiz_bank:
-                        correct_answer_text = self.quiz_bank[question_text]["correct_answer"]
-
-                        # Find the radio input that matches the correct answer text
-                        for radio_input in radio_inputs:
-                            try:
-                                # Get the label associated with this radio input
-                                radio_id = radio_input.get_attribute('id')
-                                label = quiz_card.find_element(By.CSS_SELECTOR, f'label[for="{radio_id}"]')
-
-                                # Get only the first span text (not feedback text)
-                                spans = label.find_elements(By.CSS_SELECTOR, 'div.option-content-wrapper > span')
-                                if spans:
-                                    option_text = spans[0].text.strip()
-                                else:
-                                    option_text = label.text.strip()
-
-                                # Check if this option matches the correct answer
-                                if option_text == correct_answer_text:
-                                    selected_option = radio_input
-                                    print(f"Found question in bank, using correct answer: {option_text[:50]}...")
-                                    break
-                            except:
-                                continue
-
-                        # If we didn't find a match, select randomly
-                        if not selected_option:
+                    # Check if question is in quiz bank (exact or near match)
+                    entry, confidence = self.quiz_bank.lookup(question_text) if question_text else (None, 0.0)
+                    if entry:
+                        # Read every option label (first span only, not feedback text) in one round trip
+                        option_texts = self.driver.execute_script(_OPTION_TEXTS_SCRIPT, quiz_card)
+                        option_index, option_confidence = match_option(option_texts, entry["correct_answer"])
+
+                        if option_index is not None:
+                            selected_option = radio_inputs[option_index]
+                            print(f"Found question in bank (confidence {confidence:.2f}), "
+                                  f"using correct answer (confidence {option_confidence:.2f}): "
+                                  f"{option_texts[option_index][:50]}...")
+                        else:
+                            # If we didn't find a match, select randomly
                             selected_option = random.choice(radio_inputs)
-                            print(f"Question in bank but couldn't match answer text, selecting randomly")
-                            import json
-                            print(json.dumps(self.quiz_bank[question_text], indent=2))
-                            time.sleep(2)
+                            print(f"Question in bank but couldn't match answer "
+                                  f"{str(entry['correct_answer'])[:50]!r}, selecting randomly")
                     else:
                         # Randomly select one option
                         selected_option = random.choice(radio_inputs)
@@ -245,16 +303,23 @@ class QuizHandler(BaseHandler):
 
                     selected_option.click()
                     question_count += 1
+                    self.progress += 1
                     print(f"Answered question {question_count}")
 
-                    time.sleep(1)  # Brief pause
+                    # Wait for the answer to enable the Next button (or the submit button on the last question)
+                    try:
+                        self.wait.until(EC.presence_of_element_located((
+                            By.CSS_SELECTOR,
+                            'div.lesson-button--next:not(.lesson-button--disabled), div.check-answer-container button'
+                        )), expected_timeout=True)
+                    except TimeoutException:
+                        pass
 
                     # Look for Next button
                     try:
                         next_button = self.driver.find_element(By.CSS_SELECTOR, 'div.lesson-button--next:not(.lesson-button--disabled)')
                         next_button.click()
-                        time.sleep(2)  # Wait for next question to load
-                    except:
+                    except (NoSuchElementException, ElementNotInteractableException):
                         # No next button found, try to find and click submit button
                         try:
                             submit_button = self.driver.find_element(By.CSS_SELECTOR, 'div.check-answer-container button')
@@ -265,10 +330,22 @@ class QuizHandler(BaseHandler):
                         # No more next button, quiz is complete
                         print(f"Quiz completed! Answered {question_count} questions")
                         break
+
+                    # Wait for next question to load
+                    try:
+                        if full_question:
+                            self._wait_for_question_change(full_question)
+                        else:
+                            self.wait.until(EC.staleness_of(quiz_card))
+                    except TimeoutException:
+                        # Re-read the question on screen, answering it again if it is still the same one
+                        print("Next question didn't render in time, re-reading the current question")
                 else:
                     print("No more questions found")
                     break
 
             except Exception as e:
                 print(f"Error answering questions: {e}")
-                break
\ No newline at end of file
+                break
+
+        print(self.quiz_bank.index.summary())
\ No newline at end of file
@@ -1,17 +1,195 @@
 #!/usr/bin/env python3
+import time
+
+# Time-to-first-section is measured from here
+PROCESS_START = time.monotonic()
+
 import argparse
-from website_driver import WebsiteDriver
+import os
+from utils import (QUIZ_BANK_FILENAME, RENDERERS, ContentManifest, SearchIndex, StudyGuideCompiler, load_document,
+                   read_quiz_bank, write_file_atomic)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def print_coverage():
+    """Print how many files and lessons the manifest has archived per chapter and content type"""
+    manifest = ContentManifest(os.path.join(SCRIPT_DIR, "saved", "manifest.db"))
+    rows = manifest.coverage()
+    manifest.close()
+    if not rows:
+        print("Nothing archived yet")
+        return
+
+    print(f"{'Chapter':<50} {'Type':<14} {'Files':>6} {'Lessons':>8}")
+    for chapter, content_type, files, lessons in rows:
+        print(f"{(chapter or '-'):<50} {content_type:<14} {files:>6} {lessons:>8}")
+
+
+def render_outputs(output_format, output_dir=None):
+    """Regenerate every saved output in output_format from its JSONL records, without the browser"""
+    content_dir = os.path.join(SCRIPT_DIR, "content")
+    extension, renderer = RENDERERS[output_format]
+    output_dir = output_dir or os.path.join(SCRIPT_DIR, "rendered", output_format)
+    start = time.monotonic()
+    rendered = 0
+    for root, _, files in os.walk(content_dir):
+        for name in sorted(files):
+            if not name.endswith(".jsonl"):
+                continue
+            path = os.path.join(root, name)
+            document = load_document(path)
+            target = os.path.join(output_dir, os.path.relpath(os.path.splitext(path)[0], content_dir))
+            write_file_atomic(f"{target}.{extension}", renderer(document))
+            rendered += 1
+    print(f"Rendered {rendered} documents as {output_format} to {output_dir} in {time.monotonic() - start:.2f}s")
+
+
+def build_study_guides(output_dir=None, workers=None, full=False):
+    """Compile content/ into one study guide per chapter plus an index, reprocessing only changed files"""
+    compiler = StudyGuideCompiler(
+        os.path.join(SCRIPT_DIR, "content"),
+        output_dir or os.path.join(SCRIPT_DIR, "study_guides"),
+        os.path.join(SCRIPT_DIR, "saved", "study_guide_cache.json"),
+        workers=workers
+    )
+    stats = compiler.build(full=full)
+    print(f"Built study guides from {stats['sources']} files in {stats['seconds']:.2f}s: "
+          f"{stats['read']} read, {stats['modified']} changed, {stats['chapters_written']} chapters written, "
+          f"{stats['chapters_removed']} removed")
+
+
+def export_quiz_banks(output_format):
+    """Write each chapter's consolidated quiz bank next to its append-only quiz_bank.jsonl"""
+    extension, renderer = RENDERERS[output_format]
+    exported = 0
+    for root, _, files in os.walk(os.path.join(SCRIPT_DIR, "content")):
+        if QUIZ_BANK_FILENAME not in files:
+            continue
+        document = read_quiz_bank(os.path.join(root, QUIZ_BANK_FILENAME))
+        output_path = os.path.join(root, f"quiz_bank.{extension}")
+        write_file_atomic(output_path, renderer(document))
+        print(f"Wrote {len(document.records)} questions to {os.path.relpath(output_path, SCRIPT_DIR)}")
+        exported += 1
+    if not exported:
+        print("No quiz banks exported yet")
+
+
+def open_search_index():
+    return SearchIndex(os.path.join(SCRIPT_DIR, "saved", "search_index"), os.path.join(SCRIPT_DIR, "content"))
+
+
+def update_search_index(full=False):
+    """Index new and changed files under content/"""
+    stats = open_search_index().update(full=full)
+    print(f"Indexed {stats['documents']} documents in {stats['seconds']:.2f}s: "
+          f"{stats['read']} read, {stats['removed']} removed")
+
+
+def search(terms, limit=10):
+    """Print the best BM25 matches for terms"""
+    index = open_search_index()
+    start = time.monotonic()
+    # Pick up whatever the scraper has saved since the last update, without walking content/
+    if index.pending():
+        index.update(journal_only=True)
+    hits = index.search(terms, limit)
+    elapsed = time.monotonic() - start
+    for hit in hits:
+        print(f"{hit['score']:6.2f}  {(hit['chapter'] or '-')} / {hit['content_type']} / {hit['lesson']}")
+        print(f"        {os.path.relpath(hit['path'], SCRIPT_DIR)}")
+    print(f"{len(hits)} hits in {elapsed * 1000:.1f}ms")
+    index.close()
+
 
 def main():
     parser = argparse.ArgumentParser(description='Login to Real Estate U')
     parser.add_argument('-u', '--username', required=False, help='Username', default="")
     parser.add_argument('-p', '--password', required=False, help='Password', default="")
+    parser.add_argument('--next-timeout', type=float, default=300,
+                        help='Maximum seconds to wait for the next button to enable')
+    parser.add_argument('--cache-course-types', action='store_true',
+                        help='Remember the classified course type of each section URL')
+    parser.add_argument('--background-writes', action='store_true',
+                        help='Write output files on a background thread')
+    parser.add_argument('--skip-archived', action='store_true',
+                        help='Skip sections whose URL is already recorded in the content manifest')
+    parser.add_argument('--fresh', action='store_true',
+                        help='Ignore the saved checkpoint and start from the Resume button')
+    parser.add_argument('--persist-session', action='store_true',
+                        help='Save the logged-in session and reuse it on later runs')
+    parser.add_argument('--lean', action='store_true',
+                        help='Run headless Chrome with images, fonts, media and trackers blocked')
+    parser.add_argument('--instrument', action='store_true',
+                        help='Count WebDriver round trips per section and handler method')
+    parser.add_argument('--trace', action='store_true',
+                        help='Write a Chrome trace-event file of every phase to saved/traces/')
+    parser.add_argument('--memory-limit', type=int, default=768,
+                        help='Restart the browser when the renderer JS heap exceeds this many MB (0 only logs)')
+    parser.add_argument('--memory-check-every', type=int, default=10,
+                        help='Sample renderer memory every N sections (0 disables the watchdog)')
+    parser.add_argument('--section-budget', type=float, default=1200,
+                        help='Seconds a section may take before it counts as over budget')
+    parser.add_argument('--phase-budget', type=float, default=300,
+                        help='Seconds a quiz attempt or review loop may run before giving up')
+
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('coverage', help='Show what has been archived per chapter')
+    render_parser = subparsers.add_parser('render', help='Regenerate saved outputs from their JSONL records')
+    render_parser.add_argument('format', choices=sorted(RENDERERS), help='Output format')
+    render_parser.add_argument('-o', '--output', help='Output directory (default: rendered/<format>/)')
+    build_parser = subparsers.add_parser('build', help='Compile per-chapter study guides from content/')
+    build_parser.add_argument('-o', '--output', help='Output directory (default: study_guides/)')
+    build_parser.add_argument('--workers', type=int, help='Worker processes for large rebuilds')
+    build_parser.add_argument('--full', action='store_true', help='Ignore the build cache and reprocess every file')
+    quiz_parser = subparsers.add_parser('quiz-bank', help='Write each chapter\'s consolidated quiz bank')
+    quiz_parser.add_argument('format', nargs='?', default='md', choices=sorted(RENDERERS), help='Output format')
+    index_parser = subparsers.add_parser('index', help='Update the full-text search index over content/')
+    index_parser.add_argument('--full', action='store_true', help='Rebuild the index from scratch')
+    search_parser = subparsers.add_parser('search', help='Search the archived content')
+    search_parser.add_argument('terms', help='Search terms')
+    search_parser.add_argument('-n', '--limit', type=int, default=10, help='Maximum number of hits')
 
     args = parser.parse_args()
 
-    w_driver = WebsiteDriver(args.username, args.password)
+    if args.command == 'coverage':
+        print_coverage()
+        return
+    if args.command == 'render':
+        render_outputs(args.format, args.output)
+        return
+    if args.command == 'build':
+        build_study_guides(args.output, args.workers, args.full)
+        return
+    if args.command == 'quiz-bank':
+        export_quiz_banks(args.format)
+        return
+    if args.command == 'index':
+        update_search_index(args.full)
+        return
+    if args.command == 'search':
+        search(args.terms, args.limit)
+        return
+
+    # Selenium, dotenv and the handlers are only needed to actually drive the browser
+    from website_driver import WebsiteDriver
+
+    w_driver = WebsiteDriver(args.username, args.password, next_timeout=args.next_timeout,
+                             cache_course_types=args.cache_course_types,
+                             background_writes=args.background_writes,
+                             skip_archived=args.skip_archived,
+                             resume_checkpoint=not args.fresh,
+                             persist_session=args.persist_session,
+                             lean=args.lean,
+                             instrument=args.instrument,
+                             trace=args.trace,
+                             started_at=PROCESS_START,
+                             memory_limit_mb=args.memory_limit,
+                             memory_check_every=args.memory_check_every,
+                             section_budget=args.section_budget,
+                             phase_budget=args.phase_budget)
     w_driver.start_studying()
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
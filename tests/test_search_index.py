@@ -0,0 +1,62 @@
+import os
+from utils.search_index import SearchIndex
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_modified_then_deleted_file_leaves_the_index(tmp_path):
+    content_dir = str(tmp_path / "content")
+    lesson = os.path.join(content_dir, "C", "lessons", "1_a.md")
+    _write(lesson, "alpha beta")
+    _write(os.path.join(content_dir, "C", "lessons", "2_b.md"), "gamma delta")
+    index_dir = str(tmp_path / "index")
+
+    SearchIndex(index_dir, content_dir).update()
+    _write(lesson, "alpha beta epsilon")
+    os.utime(lesson, ns=(1, 1))
+    assert SearchIndex(index_dir, content_dir).update()["read"] == 1
+
+    os.remove(lesson)
+    index = SearchIndex(index_dir, content_dir)
+    assert index.update()["removed"] == 1
+    assert index.search("alpha") == []
+    assert [hit["lesson"] for hit in index.search("gamma")] == ["b"]
+
+
+def test_quiz_banks_are_indexed(tmp_path):
+    from utils.quiz_export import append_quiz_records
+    from utils.records import QuizQuestionRecord
+
+    content_dir = str(tmp_path / "content")
+    bank = os.path.join(content_dir, "C", "quiz", "quiz_bank.jsonl")
+    append_quiz_records(bank, [QuizQuestionRecord("What is escrow?", ["A", "B"], "A", 0, "Held by a neutral party")])
+    index = SearchIndex(str(tmp_path / "index"), content_dir)
+    index.update()
+    assert [hit["path"] for hit in index.search("neutral party")] == [bank]
+
+
+def test_journal_only_update_reads_just_the_journaled_files(tmp_path):
+    content_dir = str(tmp_path / "content")
+    index = SearchIndex(str(tmp_path / "index"), content_dir)
+    _write(os.path.join(content_dir, "C", "lessons", "1_a.md"), "alpha")
+    index.update()
+
+    journaled = os.path.join(content_dir, "C", "lessons", "2_b.md")
+    _write(journaled, "alpha beta")
+    _write(os.path.join(content_dir, "C", "lessons", "3_c.md"), "beta gamma")
+    index.journal.add(journaled)
+    assert index.pending()
+    assert index.update(journal_only=True)["read"] == 1
+    assert not index.pending()
+    assert [hit["lesson"] for hit in index.search("beta")] == ["b"]
+    index.close()
+
+    os.remove(journaled)
+    index.journal.add(journaled)
+    assert index.update(journal_only=True)["removed"] == 1
+    assert [hit["lesson"] for hit in index.search("alpha")] == ["a"]
+    index.close()
@@ -0,0 +1,17 @@
+from utils.stall_detector import StallDetector
+
+
+def test_repeated_quiz_url_with_progress_is_not_a_stall():
+    detector = StallDetector(section_budget=60)
+    # A quiz attempt, its review and the next attempt all fingerprint the same page
+    assert [detector.observe("quiz", 30, progressed=True) for _ in range(6)] == [None] * 6
+    assert detector.stalls == 0
+    assert detector.lost_seconds == 0
+
+
+def test_unchanged_section_without_progress_escalates():
+    detector = StallDetector()
+    steps = [detector.observe("page", 1) for _ in range(5)]
+    assert steps == [None, "reload", "resume", "recycle", "give_up"]
+    assert detector.observe("page", 1, progressed=True) is None
+    assert detector.observe("page", 1) == "reload"
@@ -0,0 +1,82 @@
+import importlib
+from .background_writer import BackgroundWriter, write_file_atomic
+from .browser_metrics import BrowserMetrics
+from .checkpoint import Checkpoint
+from .content_manifest import ContentManifest, content_hash, file_hash
+from .download_tracker import DownloadTracker
+from .file_numbering import FileNumberer, file_numberer
+from .memory_watchdog import MemoryWatchdog
+from .quiz_bank_store import QuizBankStore
+from .quiz_export import QUIZ_BANK_FILENAME, append_quiz_records, load_document, read_quiz_bank
+from .quiz_matcher import QuestionIndex, match_option, normalize_text
+from .records import (ActivityQuestionRecord, Document, LessonRecord, QuizQuestionRecord, ReviewOption,
+                      WalkthroughRecord, option_status)
+from .renderers import RENDERERS, render_html, render_json, render_markdown
+from .search_index import SearchIndex, SearchJournal
+from .session_store import SessionStore
+from .stall_detector import StallDetector
+from .study_guide import StudyGuideCompiler
+from .tracer import NULL_TRACER, NullTracer, Tracer, traced
+from .webdriver_stats import CommandStats
+
+# Selenium-backed helpers, imported on first use so offline commands start without Selenium.
+# They stay out of __all__ so `from utils import *` never pulls in Selenium.
+_LAZY_EXPORTS = {
+    'build_chrome_options': '.browser_profile',
+    'apply_lean_network_rules': '.browser_profile',
+    'ChromedriverCache': '.chromedriver',
+    'SharedChromeService': '.chromedriver',
+    'PageReadiness': '.page_readiness',
+    'AdaptiveWait': '.timing_policy',
+    'TimingPolicy': '.timing_policy',
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+
+
+__all__ = [
+    'BackgroundWriter',
+    'BrowserMetrics',
+    'write_file_atomic',
+    'Checkpoint',
+    'ContentManifest',
+    'content_hash',
+    'file_hash',
+    'DownloadTracker',
+    'FileNumberer',
+    'file_numberer',
+    'MemoryWatchdog',
+    'QuizBankStore',
+    'QUIZ_BANK_FILENAME',
+    'append_quiz_records',
+    'load_document',
+    'read_quiz_bank',
+    'QuestionIndex',
+    'match_option',
+    'normalize_text',
+    'Document',
+    'LessonRecord',
+    'QuizQuestionRecord',
+    'ActivityQuestionRecord',
+    'ReviewOption',
+    'WalkthroughRecord',
+    'option_status',
+    'RENDERERS',
+    'render_markdown',
+    'render_html',
+    'render_json',
+    'SearchIndex',
+    'SearchJournal',
+    'SessionStore',
+    'StallDetector',
+    'StudyGuideCompiler',
+    'NULL_TRACER',
+    'NullTracer',
+    'Tracer',
+    'traced',
+    'CommandStats'
+]
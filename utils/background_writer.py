@@ -0,0 +1,159 @@
+import os
+import queue
+import tempfile
+import threading
+
+
+def _write_temp(filepath, content):
+    """Write content to a temp file next to filepath and return its path and open file"""
+    directory = os.path.dirname(filepath) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(filepath)}.", suffix=".tmp")
+    f = os.fdopen(fd, 'w', encoding='utf-8')
+    try:
+        f.write(content)
+        f.flush()
+    except BaseException:
+        _discard_temp(temp_path, f)
+        raise
+    return temp_path, f
+
+
+def _discard_temp(temp_path, f):
+    """Close and remove a temp file that won't be renamed into place"""
+    try:
+        f.close()
+    except OSError:
+        pass
+    try:
+        os.remove(temp_path)
+    except OSError:
+        pass
+
+
+def _fsync_directory(directory):
+    """Persist renames in directory (not supported on every platform)"""
+    try:
+        fd = os.open(directory or '.', os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_file_atomic(filepath, content):
+    """Write content to filepath via a temp file and rename, so readers never see a partial file"""
+    temp_path, f = _write_temp(filepath, content)
+    try:
+        with f:
+            os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+    except BaseException:
+        _discard_temp(temp_path, f)
+        raise
+    _fsync_directory(os.path.dirname(filepath))
+
+
+class BackgroundWriter:
+    """Writes files atomically on a background thread with a bounded queue.
+
+    Queued files are written in batches: every temp file in a batch is written first,
+    then fsynced, then renamed into place, and each touched directory is fsynced once.
+    write() only blocks when max_pending files are already waiting.
+    """
+
+    def __init__(self, max_pending=64, batch_size=16):
+        self.batch_size = batch_size
+        self.written = 0
+        self.failed = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="background-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, filepath, content, on_written=None):
+        """Queue content to be written to filepath, calling on_written() once it is on disk"""
+        self._queue.put((filepath, content, on_written))
+
+    def flush(self):
+        """Block until every queued file has been written"""
+        self._queue.join()
+
+    def close(self):
+        """Flush pending writes and stop the writer thread"""
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        print(f"Background writer finished: {self.written} files written, {self.failed} failed")
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in batch:
+                stopping = True
+            try:
+                self._write_batch([item for item in batch if item is not None])
+            except Exception as e:
+                self.failed += 1
+                print(f"Background write batch failed: {e}")
+            finally:
+                # Always, or flush() and close() would wait forever
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, batch):
+        pending = []
+        for filepath, content, on_written in batch:
+            try:
+                temp_path, f = _write_temp(filepath, content)
+                pending.append((filepath, temp_path, f, on_written))
+            except Exception as e:
+                self.failed += 1
+                print(f"Background write failed for {filepath}: {e}")
+
+        # fsync the whole batch first, then rename it into place
+        synced = []
+        for filepath, temp_path, f, on_written in pending:
+            try:
+                with f:
+                    os.fsync(f.fileno())
+                synced.append((filepath, temp_path, f, on_written))
+            except Exception as e:
+                self.failed += 1
+                _discard_temp(temp_path, f)
+                print(f"Background write failed for {filepath}: {e}")
+
+        directories = set()
+        written = []
+        for filepath, temp_path, f, on_written in synced:
+            try:
+                os.replace(temp_path, filepath)
+                directories.add(os.path.dirname(filepath))
+                written.append((filepath, on_written))
+                self.written += 1
+            except Exception as e:
+                self.failed += 1
+                _discard_temp(temp_path, f)
+                print(f"Background write failed for {filepath}: {e}")
+
+        for directory in directories:
+            _fsync_directory(directory)
+
+        for filepath, on_written in written:
+            if not on_written:
+                continue
+            try:
+                on_written()
+            except Exception as e:
+                self.failed += 1
+                print(f"Background write callback failed for {filepath}: {e}")
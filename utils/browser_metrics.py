@@ -0,0 +1,43 @@
+def read_performance_metrics(driver):
+    """CDP Performance.getMetrics as a name -> value dict, empty if unavailable"""
+    try:
+        metrics = driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']
+    except Exception:
+        return {}
+    return {metric['name']: metric['value'] for metric in metrics}
+
+
+class BrowserMetrics:
+    """Section load times and renderer memory samples for one browser profile"""
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.load_times = []
+        self.heap_samples = []
+
+    def enable(self, driver):
+        """Turn on the CDP performance domain so memory can be sampled"""
+        try:
+            driver.execute_cdp_cmd('Performance.enable', {})
+        except Exception as e:
+            print(f"Could not enable performance metrics: {e}")
+
+    def sample(self, driver, load_seconds):
+        """Record a section's load time and the renderer's current JS heap usage"""
+        self.load_times.append(load_seconds)
+        values = read_performance_metrics(driver)
+        if values:
+            self.heap_samples.append(values.get('JSHeapUsedSize', 0) / (1024 * 1024))
+
+    def summary(self):
+        """One-line comparison-friendly summary of the samples"""
+        if not self.load_times:
+            return f"[{self.profile} profile] no sections loaded"
+        load_times = sorted(self.load_times)
+        p95 = load_times[min(len(load_times) - 1, int(len(load_times) * 0.95))]
+        line = (f"[{self.profile} profile] page load avg {sum(load_times) / len(load_times):.2f}s, "
+                f"p95 {p95:.2f}s over {len(load_times)} sections")
+        if self.heap_samples:
+            line += (f"; renderer JS heap avg {sum(self.heap_samples) / len(self.heap_samples):.1f}MB, "
+                     f"max {max(self.heap_samples):.1f}MB")
+        return line
@@ -0,0 +1,47 @@
+from selenium import webdriver
+
+
+# Heavy resources the scraper never reads: images, fonts, media and tracking scripts.
+# PDFs are left alone so infographic downloads keep working.
+LEAN_BLOCKED_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.m3u8', '*.mp3',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*facebook.net*', '*hotjar.com*', '*segment.io*', '*intercom.io*'
+]
+
+
+def build_chrome_options(download_dir, lean=False):
+    """Chrome options for the default profile, or the headless resource-blocking lean profile"""
+    chrome_options = webdriver.ChromeOptions()
+    prefs = {
+        "download.default_directory": download_dir,
+        "download.prompt_for_download": False,
+        "download.directory_upgrade": True,
+        "safebrowsing.enabled": True
+    }
+
+    if lean:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1280,800")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--mute-audio")
+        prefs.update({
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            # Save PDFs instead of opening them in the built-in viewer
+            "plugins.always_open_pdf_externally": True
+        })
+
+    chrome_options.add_experimental_option("prefs", prefs)
+    # Page events (download start/progress) are read back from the performance log
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": False, "enablePage": True})
+    return chrome_options
+
+
+def apply_lean_network_rules(driver):
+    """Block heavy resources over CDP"""
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
@@ -0,0 +1,35 @@
+import json
+import os
+import time
+from .background_writer import write_file_atomic
+
+
+class Checkpoint:
+    """Last known traversal position, saved as JSON so a restarted run can resume there"""
+
+    def __init__(self, path, every=1):
+        self.path = path
+        self.every = every
+        self._since_save = 0
+
+    def load(self):
+        """Return the saved checkpoint dict, or None if there isn't a readable one"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def save(self, url, counters, force=False):
+        """Save url and counters, but only every `every` calls unless forced"""
+        self._since_save += 1
+        if not force and self._since_save < self.every:
+            return
+        self._since_save = 0
+        data = {"url": url, "counters": counters, "saved_at": time.time()}
+        write_file_atomic(self.path, json.dumps(data, indent=2))
+
+    def clear(self):
+        """Remove the saved checkpoint"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
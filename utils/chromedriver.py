@@ -0,0 +1,79 @@
+import json
+import os
+from selenium.webdriver.chrome.service import Service
+from .background_writer import write_file_atomic
+
+
+class ChromedriverCache:
+    """Remembers the chromedriver binary so later runs skip driver resolution, even offline.
+
+    The first run resolves the driver with webdriver_manager, falling back to letting
+    Selenium resolve it, and records the path it ended up using. Later runs use the
+    recorded path directly. forget() drops it, e.g. after Chrome updated past the driver.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def resolve(self):
+        """Path to a chromedriver binary, or None to leave resolution to Selenium"""
+        cached = self.cached()
+        if cached:
+            return cached
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            driver_path = ChromeDriverManager().install()
+        except Exception as e:
+            print(f"webdriver_manager could not resolve chromedriver, leaving it to Selenium: {e}")
+            return None
+        self.remember(driver_path)
+        return driver_path
+
+    def cached(self):
+        """The recorded driver path if it is still an executable file"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                driver_path = json.load(f).get('path')
+        except (OSError, ValueError):
+            return None
+        if driver_path and os.path.isfile(driver_path) and os.access(driver_path, os.X_OK):
+            return driver_path
+        return None
+
+    def remember(self, driver_path):
+        if driver_path and driver_path != self.cached():
+            write_file_atomic(self.path, json.dumps({'path': driver_path}))
+
+    def forget(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class SharedChromeService(Service):
+    """chromedriver service that outlives the drivers using it.
+
+    Each webdriver.Chrome calls start() and, on quit(), stop(). Here start() only launches
+    chromedriver if it isn't already running and stop() does nothing, so a driver restart
+    within a run opens a new session on the same process. shutdown() really stops it.
+    """
+
+    def start(self):
+        process = getattr(self, 'process', None)
+        if process is None or process.poll() is not None:
+            super().start()
+
+    def stop(self):
+        pass
+
+    def shutdown(self):
+        """Stop the chromedriver process"""
+        if getattr(self, 'process', None) is not None:
+            super().stop()
+
+    def __del__(self):
+        try:
+            self.shutdown()
+        except Exception:
+            pass
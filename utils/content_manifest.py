@@ -0,0 +1,95 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+
+def content_hash(content):
+    """sha256 of text or bytes content"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_hash(filepath):
+    """sha256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ContentManifest:
+    """SQLite record of every file the handlers archive.
+
+    One row per saved file: chapter, lesson, content type, content hash, source URL and
+    output path. Handlers use it to skip sections that are already archived unchanged,
+    and coverage() summarizes what a course run has produced so far.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Shared with background workers, so serialize access ourselves
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, chapter TEXT, lesson TEXT, content_type TEXT NOT NULL, '
+            'content_hash TEXT NOT NULL, source_url TEXT, output_path TEXT NOT NULL, created_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS entries_source ON entries (source_url, content_type)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS entries_hash ON entries (content_type, content_hash)')
+        self._conn.commit()
+
+    def record(self, chapter, lesson, content_type, content_hash, source_url, output_path):
+        """Add an entry for a saved file"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO entries (chapter, lesson, content_type, content_hash, source_url, output_path, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (chapter, lesson, content_type, content_hash, source_url, output_path, time.time())
+            )
+            self._conn.commit()
+
+    def find(self, source_url, content_type):
+        """Return the latest entry saved from source_url whose output file still exists, or None"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT * FROM entries WHERE source_url = ? AND content_type = ? ORDER BY id DESC',
+                (source_url, content_type)
+            ).fetchall()
+        for row in rows:
+            if os.path.exists(row['output_path']):
+                return dict(row)
+        return None
+
+    def find_duplicate(self, chapter, lesson, content_type, content_hash):
+        """Return an existing entry with identical content for the same lesson, or None"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT * FROM entries WHERE content_type = ? AND content_hash = ? '
+                'AND chapter IS ? AND lesson IS ? ORDER BY id DESC',
+                (content_type, content_hash, chapter, lesson)
+            ).fetchall()
+        for row in rows:
+            if os.path.exists(row['output_path']):
+                return dict(row)
+        return None
+
+    def coverage(self):
+        """Return (chapter, content_type, files, lessons) rows summarizing the archive"""
+        with self._lock:
+            return [tuple(row) for row in self._conn.execute(
+                'SELECT chapter, content_type, COUNT(*), COUNT(DISTINCT lesson) FROM entries '
+                'GROUP BY chapter, content_type ORDER BY chapter, content_type'
+            )]
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
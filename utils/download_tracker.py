@@ -0,0 +1,107 @@
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+
+
+class DownloadTracker:
+    """Tracks browser downloads by GUID and finishes them on a background worker.
+
+    Chrome is told to name every download after its GUID and to emit download events,
+    which are read back from the performance log. Each download is then matched to the
+    exact file it produced, so overlapping downloads can't be confused, and waiting for
+    completion plus the move into place happen off the browser thread.
+    """
+
+    def __init__(self, download_dir, timeout=60):
+        self.download_dir = download_dir
+        self.timeout = timeout
+        self.completed = 0
+        self.failed = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="download-tracker", daemon=True)
+        self._thread.start()
+
+    def enable(self, driver):
+        """Name downloads by GUID and turn on download events for this browser"""
+        driver.execute_cdp_cmd('Browser.setDownloadBehavior', {
+            'behavior': 'allowAndName',
+            'downloadPath': self.download_dir,
+            'eventsEnabled': True
+        })
+
+    def discard_events(self, driver):
+        """Drop buffered performance log entries, so the log stays small and the next download's events stand alone"""
+        try:
+            driver.get_log('performance')
+        except Exception:
+            pass
+
+    def wait_for_start(self, driver, before, timeout=10):
+        """Return the GUID of the download that just started, or None if it couldn't be identified.
+
+        Falls back to the first new file in the download directory (compared with the
+        `before` listing) when the browser doesn't report download events.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            for entry in self._read_events(driver):
+                if entry['method'] in ('Browser.downloadWillBegin', 'Page.downloadWillBegin'):
+                    print(f"Download started: {entry['params'].get('suggestedFilename')}")
+                    return entry['params']['guid']
+
+            new_files = [f for f in os.listdir(self.download_dir) if f not in before and not f.endswith('.crdownload')]
+            if new_files:
+                return new_files[0]
+            time.sleep(0.1)
+        return None
+
+    def finish_in_background(self, guid, destination, on_done=None):
+        """Wait for the download to finish, move it to destination, then call on_done(destination)"""
+        self._queue.put((guid, destination, on_done))
+
+    def close(self):
+        """Finish queued downloads and stop the worker"""
+        self._queue.join()
+        self._queue.put(None)
+        self._thread.join()
+        print(f"Downloads finished: {self.completed} saved, {self.failed} failed")
+
+    def _read_events(self, driver):
+        for entry in driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            if message.get('method', '').endswith(('downloadWillBegin', 'downloadProgress')):
+                yield message
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                self._queue.task_done()
+                return
+            guid, destination, on_done = job
+            try:
+                self._finish(guid, destination, on_done)
+            except Exception as e:
+                self.failed += 1
+                print(f"Download {guid} failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _finish(self, guid, destination, on_done):
+        source = os.path.join(self.download_dir, guid)
+        deadline = time.monotonic() + self.timeout
+        # Chrome renames the finished download to its final (GUID) name in one step
+        while not os.path.exists(source):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"not finished after {self.timeout}s")
+            time.sleep(0.2)
+
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.move(source, destination)
+        self.completed += 1
+        print(f"Saved infographic to: {destination}")
+        if on_done:
+            on_done(destination)
@@ -0,0 +1,55 @@
+import os
+import threading
+
+
+class FileNumberer:
+    """Hands out the numeric filename prefix for each output directory.
+
+    Each directory is scanned once; after that numbers come from an in-process counter.
+    The directory's mtime is checked on every call so files added by something else
+    trigger a rescan, and the counter never goes backwards so a number that was handed
+    out but not yet written is never reused.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._mtimes = {}
+
+    def next_number(self, directory):
+        """Reserve and return the next file number for directory"""
+        with self._lock:
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+
+            if directory not in self._counters or mtime != self._mtimes.get(directory):
+                scanned = self._scan(directory) if mtime is not None else 0
+                self._counters[directory] = max(self._counters.get(directory, 0), scanned)
+                self._mtimes[directory] = mtime
+
+            self._counters[directory] += 1
+            return self._counters[directory]
+
+    def mark_written(self, directory):
+        """Record that we changed directory ourselves, so it isn't rescanned"""
+        with self._lock:
+            try:
+                self._mtimes[directory] = os.stat(directory).st_mtime_ns
+            except FileNotFoundError:
+                self._mtimes.pop(directory, None)
+
+    def _scan(self, directory):
+        """Return the highest number prefix in directory"""
+        highest = 0
+        for entry in os.scandir(directory):
+            # Extract number from filename like "1_filename.md"
+            prefix = entry.name.split('_', 1)[0]
+            if '_' in entry.name and prefix.isdigit():
+                highest = max(highest, int(prefix))
+        return highest
+
+
+# Shared by every handler so directories written by several handlers stay consistent
+file_numberer = FileNumberer()
@@ -0,0 +1,82 @@
+import json
+import os
+import threading
+import time
+from .browser_metrics import read_performance_metrics
+
+_MB = 1024 * 1024
+
+
+class MemoryWatchdog:
+    """Samples renderer memory every few sections and says when the browser should be recycled.
+
+    Every sample and every recycle is appended to a JSONL log, so the memory curve of a
+    long run can be plotted afterwards. A limit of 0 only logs.
+    """
+
+    def __init__(self, log_path, limit_mb=768, every=10):
+        self.log_path = log_path
+        self.limit_mb = limit_mb
+        self.every = every
+        self.last_heap_mb = None
+        self.peak_heap_mb = 0
+        self.recycles = []
+        self._last_checked = None
+        self._lock = threading.Lock()
+
+    def due(self, sections):
+        """Whether to sample after sections completed sections"""
+        return bool(self.every) and sections % self.every == 0 and sections != self._last_checked
+
+    def check(self, driver, sections):
+        """Sample memory, returns True if it is over the limit"""
+        self._last_checked = sections
+        heap_mb = self.sample(driver, sections)
+        return bool(self.limit_mb) and heap_mb is not None and heap_mb >= self.limit_mb
+
+    def sample(self, driver, sections, event="sample"):
+        """Log the renderer's heap, DOM and listener counts, returns the used JS heap in MB"""
+        values = read_performance_metrics(driver)
+        if not values:
+            return None
+        heap_mb = values.get('JSHeapUsedSize', 0) / _MB
+        self.last_heap_mb = heap_mb
+        self.peak_heap_mb = max(self.peak_heap_mb, heap_mb)
+        self._log({
+            "event": event,
+            "sections": sections,
+            "js_heap_used_mb": round(heap_mb, 1),
+            "js_heap_total_mb": round(values.get('JSHeapTotalSize', 0) / _MB, 1),
+            "nodes": int(values.get('Nodes', 0)),
+            "documents": int(values.get('Documents', 0)),
+            "listeners": int(values.get('JSEventListeners', 0)),
+        })
+        return heap_mb
+
+    def record_recycle(self, sections, reason, seconds, before_mb, after_mb):
+        self.recycles.append(seconds)
+        self._log({
+            "event": "recycle",
+            "sections": sections,
+            "reason": reason,
+            "seconds": round(seconds, 2),
+            "before_mb": round(before_mb, 1) if before_mb is not None else None,
+            "after_mb": round(after_mb, 1) if after_mb is not None else None,
+        })
+
+    def summary(self):
+        """One-line summary of the samples and recycles"""
+        if self.last_heap_mb is None:
+            return "Memory watchdog: no samples"
+        line = f"Memory watchdog: peak renderer JS heap {self.peak_heap_mb:.1f}MB"
+        if self.recycles:
+            line += (f", {len(self.recycles)} browser recycles taking {sum(self.recycles):.1f}s "
+                     f"(limit {self.limit_mb}MB)")
+        return line
+
+    def _log(self, entry):
+        entry["time"] = time.time()
+        with self._lock:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
@@ -0,0 +1,225 @@
+import time
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# Records fetch/XHR requests (start, end, and the intervals between the last few requests
+# to the same endpoint) and client-side route changes on the page. Idempotent, so it can run both
+# before every new document (via CDP) and on the current one.
+_HOOK_SCRIPT = """
+(() => {
+    if (window.__readiness) {
+        return;
+    }
+    const state = window.__readiness = {
+        token: Math.random().toString(36).slice(2),
+        pending: new Map(),
+        finished: [],
+        starts: new Map(),
+        nextId: 0,
+        lastActivity: performance.now(),
+        routeChanges: 0
+    };
+    const endpoint = (url) => {
+        try {
+            const parsed = new URL(String(url), location.href);
+            return parsed.origin + parsed.pathname;
+        } catch (e) {
+            return String(url);
+        }
+    };
+    const begin = (url) => {
+        const id = state.nextId++;
+        const now = performance.now();
+        const key = endpoint(url);
+        const starts = (state.starts.get(key) || []).concat(now).slice(-5);
+        state.starts.set(key, starts);
+        const intervals = starts.slice(1).map((start, i) => start - starts[i]);
+        state.pending.set(id, {started: now, intervals: intervals});
+        return id;
+    };
+    const end = (id) => {
+        const request = state.pending.get(id);
+        if (!request) {
+            return;
+        }
+        state.pending.delete(id);
+        request.ended = performance.now();
+        state.finished.push(request);
+        if (state.finished.length > 100) {
+            state.finished.shift();
+        }
+    };
+
+    const originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function (...args) {
+            const input = args[0];
+            const id = begin(input && input.url ? input.url : input);
+            return originalFetch.apply(this, args).finally(() => end(id));
+        };
+    }
+    const originalOpen = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function (...args) {
+        this.__readinessUrl = args[1];
+        return originalOpen.apply(this, args);
+    };
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        const id = begin(this.__readinessUrl);
+        this.addEventListener('loadend', () => end(id), {once: true});
+        return originalSend.apply(this, args);
+    };
+
+    const routeChanged = () => {
+        state.routeChanges++;
+        state.lastActivity = performance.now();
+    };
+    for (const name of ['pushState', 'replaceState']) {
+        const original = history[name];
+        history[name] = function (...args) {
+            const result = original.apply(this, args);
+            routeChanged();
+            return result;
+        };
+    }
+    window.addEventListener('popstate', routeChanged);
+    window.addEventListener('hashchange', routeChanged);
+})();
+"""
+
+# Installs the hook if this document doesn't have it yet, then reports the page state.
+# arguments[0]: requests older than this many ms are treated as background (long polling),
+# arguments[1]: CSS selector that must match for the content to count as rendered, or null,
+# arguments[2]: an endpoint requested at a steady interval shorter than this many ms, four
+# times in a row, is polling (a heartbeat or progress ping) and neither blocks nor resets
+# the idle timer. Bursts (paginated or retried fetches) rarely keep a steady interval.
+_STATE_SCRIPT = _HOOK_SCRIPT + """
+const state = window.__readiness;
+const longMs = arguments[0];
+const contentSelector = arguments[1];
+const pollGapMs = arguments[2];
+const now = performance.now();
+const polling = (request) => {
+    const intervals = request.intervals;
+    if (intervals.length < 4) {
+        return false;
+    }
+    const mean = intervals.reduce((total, gap) => total + gap, 0) / intervals.length;
+    return mean < pollGapMs && intervals.every((gap) => Math.abs(gap - mean) <= mean * 0.25);
+};
+let inflight = 0;
+let lastActivity = state.lastActivity;
+for (const request of state.pending.values()) {
+    if (polling(request) || now - request.started >= longMs) {
+        continue;
+    }
+    inflight++;
+    lastActivity = Math.max(lastActivity, request.started);
+}
+for (const request of state.finished) {
+    if (!polling(request) && request.ended - request.started < longMs) {
+        lastActivity = Math.max(lastActivity, request.ended);
+    }
+}
+return {
+    document: state.token,
+    href: location.href,
+    route_changes: state.routeChanges,
+    ready_state: document.readyState,
+    inflight: inflight,
+    idle_ms: now - lastActivity,
+    content: !contentSelector || document.querySelector(contentSelector) !== null
+};
+"""
+
+
+def _route_changed(since, state):
+    return (state['document'] != since['document'] or state['href'] != since['href']
+            or state['route_changes'] != since['route_changes'])
+
+
+class PageReadiness:
+    """Detects when the single-page app has finished moving to a new section.
+
+    document.readyState stays 'complete' across client-side navigation, so instead an
+    injected hook counts in-flight fetch/XHR requests and history route changes. A page
+    is ready once the route has moved on from the previous mark, no request has been in
+    flight for idle_ms and the content selector has rendered. Requests running longer
+    than long_request_s, and endpoints repeating at a steady interval under poll_gap_ms
+    (polling and heartbeats), are background traffic and don't hold up readiness.
+    """
+
+    def __init__(self, idle_ms=500, route_grace=3, timeout=30, long_request_s=10, poll_interval=0.1,
+                 poll_gap_ms=1000):
+        self.idle_ms = idle_ms
+        self.poll_gap_ms = poll_gap_ms
+        # Sections reloaded in place (e.g. a quiz after its review) never change route
+        self.route_grace = route_grace
+        self.timeout = timeout
+        self.long_request_s = long_request_s
+        self.poll_interval = poll_interval
+        self.ready_times = []
+        self.route_changes = 0
+        self.unchanged_routes = 0
+        self.timeouts = 0
+
+    def install(self, driver):
+        """Inject the hook into every new document and the current one"""
+        try:
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': _HOOK_SCRIPT})
+        except Exception as e:
+            # The state script installs the hook itself, just later in the page's life
+            print(f"Could not register readiness hook for new documents: {e}")
+        try:
+            driver.execute_script(_HOOK_SCRIPT)
+        except Exception as e:
+            print(f"Could not install readiness hook: {e}")
+
+    def state(self, driver, content_selector=None):
+        """Current route, network and render state of the page"""
+        return driver.execute_script(_STATE_SCRIPT, self.long_request_s * 1000, content_selector, self.poll_gap_ms)
+
+    def wait_until_ready(self, driver, since=None, content_selector=None):
+        """Wait for a route change from since (if given), network idle and rendered content.
+
+        Returns the page state once ready, to pass as since for the next section.
+        """
+        start = time.monotonic()
+        if since is not None:
+            try:
+                self._wait(driver, self.route_grace).until(
+                    lambda d: _route_changed(since, self.state(d))
+                )
+                self.route_changes += 1
+            except TimeoutException:
+                self.unchanged_routes += 1
+
+        try:
+            state = self._wait(driver, self.timeout).until(lambda d: self._ready(d, content_selector))
+        except TimeoutException:
+            self.timeouts += 1
+            print(f"Page still loading after {self.timeout}s, continuing anyway")
+            state = self.state(driver, content_selector)
+        self.ready_times.append(time.monotonic() - start)
+        return state
+
+    def summary(self):
+        """One-line summary of the readiness waits"""
+        if not self.ready_times:
+            return "Page readiness: no waits"
+        return (f"Page readiness: avg {sum(self.ready_times) / len(self.ready_times):.2f}s, "
+                f"max {max(self.ready_times):.2f}s over {len(self.ready_times)} waits; "
+                f"{self.route_changes} route changes, {self.unchanged_routes} unchanged, "
+                f"{self.timeouts} timeouts")
+
+    def _wait(self, driver, timeout):
+        return WebDriverWait(driver, timeout, poll_frequency=self.poll_interval,
+                             ignored_exceptions=[JavascriptException])
+
+    def _ready(self, driver, content_selector):
+        state = self.state(driver, content_selector)
+        if (state['ready_state'] == 'complete' and state['inflight'] == 0
+                and state['idle_ms'] >= self.idle_ms and state['content']):
+            return state
+        return False
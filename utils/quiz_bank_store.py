@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections.abc import MutableMapping
+from .quiz_matcher import QuestionIndex, normalize_text
+
+
+def question_key(text):
+    """Stable hash of the normalized question text"""
+    return hashlib.sha1(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+def _entry_digest(entry):
+    return hashlib.sha1(json.dumps(entry, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class QuizBankStore(MutableMapping):
+    """Quiz bank persisted to SQLite (WAL mode), keyed by a hash of the normalized question.
+
+    Behaves like the plain dict the quiz handler used before: entries are looked up by
+    question text, every write is committed immediately, and the database is only read
+    the first time the bank is accessed. lookup() adds fuzzy matching through a
+    QuestionIndex for questions whose text differs slightly from the stored one.
+    The digest of each entry's last export is kept too, so exports only write what
+    is new or changed, and only into the chapter the entry was scraped in.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._entries = None
+        self._exported = None
+        self.index = QuestionIndex()
+
+    def _load(self):
+        """Open the database and load every entry into memory on first use"""
+        if self._entries is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS questions ('
+                'key TEXT PRIMARY KEY, question TEXT NOT NULL, data TEXT NOT NULL, updated_at REAL NOT NULL)'
+            )
+            self._conn.execute('CREATE TABLE IF NOT EXISTS exports (key TEXT PRIMARY KEY, digest TEXT NOT NULL)')
+            self._conn.commit()
+            self._exported = dict(self._conn.execute('SELECT key, digest FROM exports'))
+            # Re-derive keys from the question so older rows survive normalization changes
+            self._entries = {}
+            for question, data in self._conn.execute('SELECT question, data FROM questions'):
+                key = question_key(question)
+                self._entries[key] = json.loads(data)
+                self.index.add(key, question)
+            print(f"Loaded {len(self._entries)} questions from quiz bank at {self.path}")
+        return self._entries
+
+    def __getitem__(self, question):
+        return self._load()[question_key(question)]
+
+    def __setitem__(self, question, entry):
+        key = question_key(question)
+        self._load()[key] = entry
+        self.index.add(key, question)
+        self._conn.execute(
+            'INSERT OR REPLACE INTO questions (key, question, data, updated_at) VALUES (?, ?, ?, ?)',
+            (key, question, json.dumps(entry, ensure_ascii=False), time.time())
+        )
+        self._conn.commit()
+
+    def __delitem__(self, question):
+        key = question_key(question)
+        del self._load()[key]
+        self.index.remove(key)
+        self._conn.execute('DELETE FROM questions WHERE key = ?', (key,))
+        self._conn.commit()
+
+    def __contains__(self, question):
+        return question_key(question) in self._load()
+
+    def __iter__(self):
+        return iter([entry['question'] for entry in self._load().values()])
+
+    def __len__(self):
+        return len(self._load())
+
+    def lookup(self, question):
+        """Return (entry, confidence) for the closest stored question, or (None, 0.0)"""
+        entries = self._load()
+        key, confidence = self.index.lookup(question)
+        if key is None:
+            return None, 0.0
+        return entries[key], confidence
+
+    def unexported(self, chapter):
+        """Entries scraped in chapter that are new or have changed since they were last exported"""
+        # Entries saved before chapters were recorded belong to no chapter until scraped again
+        return [entry for key, entry in self._load().items()
+                if entry.get('chapter', False) == chapter and self._exported.get(key) != _entry_digest(entry)]
+
+    def mark_exported(self, entries):
+        """Record entries as exported in their current state"""
+        self._load()
+        rows = [(question_key(entry['question']), _entry_digest(entry)) for entry in entries]
+        self._exported.update(rows)
+        self._conn.executemany('INSERT OR REPLACE INTO exports (key, digest) VALUES (?, ?)', rows)
+        self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+            self._entries = None
+            self._exported = None
+            self.index = QuestionIndex()
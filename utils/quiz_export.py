@@ -0,0 +1,46 @@
+import json
+import os
+import threading
+from .quiz_bank_store import question_key
+from .records import Document, QuizQuestionRecord, record_from_dict, record_to_dict
+
+# Per-chapter append-only quiz bank, content/<chapter>/quiz/quiz_bank.jsonl
+QUIZ_BANK_FILENAME = "quiz_bank.jsonl"
+
+_append_lock = threading.Lock()
+
+
+def append_quiz_records(path, records):
+    """Append quiz question records to a chapter bank, one JSON line each"""
+    data = ''.join(json.dumps(record_to_dict(record), ensure_ascii=False) + '\n' for record in records)
+    with _append_lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def read_quiz_bank(path):
+    """Consolidate a chapter bank into a quiz Document, each question once with its latest version"""
+    questions = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = record_from_dict(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                # A line cut short by a crash mid-append
+                continue
+            if isinstance(record, QuizQuestionRecord):
+                questions[question_key(record.question)] = record
+    return Document("quiz", list(questions.values()))
+
+
+def load_document(path):
+    """Load a saved JSONL file, either a document with a header line or a chapter quiz bank"""
+    if os.path.basename(path) == QUIZ_BANK_FILENAME:
+        return read_quiz_bank(path)
+    with open(path, encoding='utf-8') as f:
+        return Document.from_jsonl(f.read())
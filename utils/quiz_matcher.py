@@ -0,0 +1,139 @@
+import re
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+
+# Smart quotes, dashes and non-breaking spaces the course renders inconsistently
+_CHARACTER_MAP = str.maketrans({
+    '\u2018': "'", '\u2019': "'", '\u201c': '"', '\u201d': '"',
+    '\u2013': '-', '\u2014': '-', '\u00a0': ' '
+})
+
+# Words that flip a question or option's meaning while barely changing its text
+_NEGATION = re.compile(r"\b(?:not|except|never|no|none|neither|nor)\b|n't")
+# Whole numbers with their thousands separators and decimals, so "$1,500" stays "1500"
+_NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?")
+
+
+def _clean(text):
+    """Unicode-normalized text without smart quotes or leading numbering ("1. ", "2) ", "a. ")"""
+    text = unicodedata.normalize('NFKC', text or '').translate(_CHARACTER_MAP)
+    return re.sub(r'^\s*(\d+|[a-zA-Z])[.)]\s+', '', text)
+
+
+def normalize_text(text):
+    """Normalize question or option text: unicode, quotes, numbering, punctuation, case, whitespace"""
+    text = re.sub(r'[^\w\s]', ' ', _clean(text).lower())
+    return ' '.join(text.split())
+
+
+def _guard(text):
+    """Negations and numbers in text, which must agree before a fuzzy match can count"""
+    text = _clean(text).lower()
+    numbers = sorted(number.replace(',', '').rstrip('.') for number in _NUMBER.findall(text))
+    return len(_NEGATION.findall(text)), tuple(numbers)
+
+
+class QuestionIndex:
+    """Exact and fuzzy lookup of quiz bank keys by question text.
+
+    Exact matches go through a dict of normalized text. Near matches only score the
+    entries sharing one of the query's rarest tokens, so a miss doesn't scan the bank,
+    and only count when both texts have the same negations and numbers, so e.g. a
+    "which is NOT" variant never borrows the answer of the positive question.
+    """
+
+    def __init__(self, min_confidence=0.8, candidate_tokens=3):
+        self.min_confidence = min_confidence
+        self.candidate_tokens = candidate_tokens
+        self._exact = {}
+        self._tokens = {}
+        self._postings = defaultdict(set)
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+
+    def add(self, key, text):
+        """Index a bank key under its question text"""
+        self.remove(key)
+        normalized = normalize_text(text)
+        tokens = set(normalized.split())
+        self._exact[normalized] = key
+        self._tokens[key] = (normalized, tokens, _guard(text))
+        for token in tokens:
+            self._postings[token].add(key)
+
+    def remove(self, key):
+        """Drop a bank key from the index"""
+        if key not in self._tokens:
+            return
+        normalized, tokens, _ = self._tokens.pop(key)
+        if self._exact.get(normalized) == key:
+            del self._exact[normalized]
+        for token in tokens:
+            self._postings[token].discard(key)
+            if not self._postings[token]:
+                del self._postings[token]
+
+    def lookup(self, text):
+        """Return (key, confidence) for the best match, or (None, 0.0) on a miss"""
+        normalized = normalize_text(text)
+        key = self._exact.get(normalized)
+        if key is not None:
+            self.hits += 1
+            return key, 1.0
+
+        tokens = set(normalized.split())
+        guard = _guard(text)
+        indexed = [token for token in tokens if token in self._postings]
+        rarest = sorted(indexed, key=lambda token: len(self._postings[token]))[:self.candidate_tokens]
+        candidates = set().union(*(self._postings[token] for token in rarest))
+
+        best_key, best_score = None, 0.0
+        for candidate in candidates:
+            candidate_text, candidate_tokens, candidate_guard = self._tokens[candidate]
+            if candidate_guard != guard:
+                continue
+            # Dice coefficient on tokens, confirmed by character-level similarity
+            overlap = 2 * len(tokens & candidate_tokens) / (len(tokens) + len(candidate_tokens))
+            if overlap < self.min_confidence:
+                continue
+            score = min(overlap, SequenceMatcher(None, normalized, candidate_text).ratio())
+            if score > best_score:
+                best_key, best_score = candidate, score
+
+        if best_score >= self.min_confidence:
+            self.fuzzy_hits += 1
+            return best_key, best_score
+        self.misses += 1
+        return None, 0.0
+
+    def summary(self):
+        """One-line summary of the hit/miss counters"""
+        total = self.hits + self.fuzzy_hits + self.misses
+        return f"Question matches: {self.hits} exact, {self.fuzzy_hits} fuzzy, {self.misses} missed (of {total})"
+
+
+def match_option(option_texts, answer_text, min_confidence=0.9):
+    """Return (index, confidence) of the option matching answer_text, or (None, 0.0)"""
+    if not answer_text:
+        return None, 0.0
+    answer = normalize_text(answer_text)
+    guard = _guard(answer_text)
+
+    best_index, best_score = None, 0.0
+    for idx, option_text in enumerate(option_texts):
+        option = normalize_text(option_text)
+        if option == answer:
+            return idx, 1.0
+        # Options differing in an amount or a negation are different answers, however similar
+        if _guard(option_text) != guard:
+            continue
+        score = SequenceMatcher(None, option, answer).ratio()
+        if score > best_score:
+            best_index, best_score = idx, score
+
+    if best_score >= min_confidence:
+        return best_index, best_score
+    return None, 0.0
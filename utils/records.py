@@ -0,0 +1,114 @@
+import json
+from dataclasses import asdict, dataclass
+from typing import ClassVar, List, Optional
+
+
+def option_status(option_class):
+    """Map a reviewed option's CSS classes to 'correct', 'incorrect' or None"""
+    # Check if this was the correct answer
+    if 'correct-feedback' in option_class or 'reveal-correct-feedback' in option_class:
+        return 'correct'
+    # Check if this was the user's incorrect answer
+    if 'incorrect-feedback' in option_class:
+        return 'incorrect'
+    return None
+
+
+@dataclass
+class LessonRecord:
+    """A lesson's title and transcript paragraphs (None when there was no transcript)"""
+    kind: ClassVar[str] = 'lesson'
+    title: Optional[str]
+    paragraphs: Optional[List[str]]
+
+
+@dataclass
+class QuizQuestionRecord:
+    """A reviewed quiz question with its options and the correct one"""
+    kind: ClassVar[str] = 'quiz_question'
+    question: str
+    options: List[str]
+    correct_answer: Optional[str]
+    correct_index: Optional[int]
+    feedback: str = ''
+
+
+@dataclass
+class ReviewOption:
+    """An option of a reviewed activity question, status is 'correct', 'incorrect' or None"""
+    text: str
+    status: Optional[str] = None
+
+
+@dataclass
+class ActivityQuestionRecord:
+    """A reviewed activity question with its options and explanation"""
+    kind: ClassVar[str] = 'activity_question'
+    text: str
+    options: List[ReviewOption]
+    explanation: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['text'], [ReviewOption(**option) for option in data['options']], data.get('explanation'))
+
+
+@dataclass
+class WalkthroughRecord:
+    """A walkthrough's reviewed questions followed by its transcript paragraphs"""
+    kind: ClassVar[str] = 'walkthrough'
+    questions: List[ActivityQuestionRecord]
+    paragraphs: List[str]
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls([ActivityQuestionRecord.from_dict(question) for question in data['questions']], data['paragraphs'])
+
+
+RECORD_TYPES = {record_type.kind: record_type
+                for record_type in (LessonRecord, QuizQuestionRecord, ActivityQuestionRecord, WalkthroughRecord)}
+
+
+def record_to_dict(record):
+    return {'type': record.kind, **asdict(record)}
+
+
+def record_from_dict(data):
+    data = dict(data)
+    record_type = RECORD_TYPES[data.pop('type')]
+    if hasattr(record_type, 'from_dict'):
+        return record_type.from_dict(data)
+    return record_type(**data)
+
+
+@dataclass
+class Document:
+    """The records behind one saved output file, plus where they were scraped from"""
+    content_type: str
+    records: list
+    chapter: Optional[str] = None
+    lesson: Optional[str] = None
+    url: Optional[str] = None
+
+    def to_dict(self):
+        return {
+            'content_type': self.content_type,
+            'chapter': self.chapter,
+            'lesson': self.lesson,
+            'url': self.url,
+            'records': [record_to_dict(record) for record in self.records]
+        }
+
+    def to_jsonl(self):
+        """A header line describing the document, then one line per record"""
+        header = {'type': 'document', 'content_type': self.content_type,
+                  'chapter': self.chapter, 'lesson': self.lesson, 'url': self.url}
+        lines = [header] + [record_to_dict(record) for record in self.records]
+        return ''.join(json.dumps(line, ensure_ascii=False) + '\n' for line in lines)
+
+    @classmethod
+    def from_jsonl(cls, text):
+        lines = [json.loads(line) for line in text.splitlines() if line.strip()]
+        header = lines[0]
+        return cls(header['content_type'], [record_from_dict(line) for line in lines[1:]],
+                   header.get('chapter'), header.get('lesson'), header.get('url'))
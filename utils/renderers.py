@@ -0,0 +1,176 @@
+import html
+import json
+from .records import ActivityQuestionRecord, LessonRecord, QuizQuestionRecord, WalkthroughRecord
+
+
+def _lesson_markdown(record):
+    markdown_content = "# Lesson\n\n"
+    if record.title is not None:
+        markdown_content += f"## {record.title}\n\n"
+    if record.paragraphs is None:
+        markdown_content += "_No content available_\n\n"
+        return markdown_content
+    for paragraph in record.paragraphs:
+        markdown_content += f"{paragraph}\n\n"
+    return markdown_content
+
+
+def _quiz_question_markdown(idx, record):
+    markdown_content = f"## Question {idx}\n\n"
+    markdown_content += f"**Question:** {record.question}\n\n"
+    markdown_content += "**Options:**\n"
+
+    # List all options with correct answer marked
+    for option_idx, option in enumerate(record.options):
+        if option_idx == record.correct_index:
+            markdown_content += f"{option_idx + 1}. {option} ✓\n"
+        else:
+            markdown_content += f"{option_idx + 1}. {option}\n"
+
+    if record.correct_index is not None:
+        markdown_content += f"\n**Correct Answer:** Option {record.correct_index + 1} - {record.correct_answer}\n\n"
+
+    if record.feedback:
+        markdown_content += f"**Feedback:** {record.feedback}\n\n"
+
+    markdown_content += "---\n\n"
+    return markdown_content
+
+
+def _option_markdown(option):
+    if option.status == 'correct':
+        return f"- **{option.text}** ✓ (Correct)\n"
+    if option.status == 'incorrect':
+        return f"- {option.text} ✗ (Your answer - Incorrect)\n"
+    return f"- {option.text}\n"
+
+
+def _activity_markdown(questions):
+    markdown_content = "# Activity Review\n\n"
+    for question_num, question in enumerate(questions, 1):
+        markdown_content += f"## Question {question_num}\n\n"
+        markdown_content += f"**{question.text}**\n\n"
+        markdown_content += "### Options:\n\n"
+
+        for option in question.options:
+            markdown_content += _option_markdown(option)
+
+        if question.explanation is not None:
+            markdown_content += f"\n**Explanation:** {question.explanation}\n\n"
+
+        markdown_content += "---\n\n"
+    return markdown_content
+
+
+def _walkthrough_markdown(record):
+    markdown_content = "# Walkthrough Review\n\n"
+    markdown_content += "## Walkthrough Question\n\n"
+    markdown_content += _activity_markdown(record.questions)
+    markdown_content += "## Educational Content\n\n"
+    for paragraph in record.paragraphs:
+        markdown_content += f"{paragraph}\n\n"
+    markdown_content += "---\n\n"
+    return markdown_content
+
+
+def render_markdown(document):
+    """Render a document as the markdown the handlers have always saved"""
+    quiz_questions = [record for record in document.records if isinstance(record, QuizQuestionRecord)]
+    activity_questions = [record for record in document.records if isinstance(record, ActivityQuestionRecord)]
+    parts = []
+    if document.content_type == "quiz":
+        parts.append("# Quiz Bank\n\n")
+        parts.extend(_quiz_question_markdown(idx, record) for idx, record in enumerate(quiz_questions, 1))
+    if document.content_type == "activities":
+        parts.append(_activity_markdown(activity_questions))
+    for record in document.records:
+        if isinstance(record, LessonRecord):
+            parts.append(_lesson_markdown(record))
+        elif isinstance(record, WalkthroughRecord):
+            parts.append(_walkthrough_markdown(record))
+    return ''.join(parts)
+
+
+def _paragraphs_html(paragraphs):
+    return ''.join(f"<p>{html.escape(paragraph)}</p>\n" for paragraph in paragraphs)
+
+
+def _activity_html(questions):
+    parts = []
+    for question_num, question in enumerate(questions, 1):
+        parts.append(f"<section class=\"question\">\n<h2>Question {question_num}</h2>\n"
+                     f"<p><strong>{html.escape(question.text)}</strong></p>\n<ul>\n")
+        for option in question.options:
+            text = html.escape(option.text)
+            if option.status == 'correct':
+                parts.append(f"<li class=\"correct\"><strong>{text}</strong> ✓ (Correct)</li>\n")
+            elif option.status == 'incorrect':
+                parts.append(f"<li class=\"incorrect\">{text} ✗ (Your answer - Incorrect)</li>\n")
+            else:
+                parts.append(f"<li>{text}</li>\n")
+        parts.append("</ul>\n")
+        if question.explanation is not None:
+            parts.append(f"<p class=\"explanation\"><strong>Explanation:</strong> {html.escape(question.explanation)}</p>\n")
+        parts.append("</section>\n")
+    return ''.join(parts)
+
+
+def _quiz_question_html(idx, record):
+    parts = [f"<section class=\"question\">\n<h2>Question {idx}</h2>\n<p><strong>{html.escape(record.question)}</strong></p>\n<ol>\n"]
+    for option_idx, option in enumerate(record.options):
+        if option_idx == record.correct_index:
+            parts.append(f"<li class=\"correct\"><strong>{html.escape(option)}</strong> ✓</li>\n")
+        else:
+            parts.append(f"<li>{html.escape(option)}</li>\n")
+    parts.append("</ol>\n")
+    if record.feedback:
+        parts.append(f"<p class=\"feedback\"><strong>Feedback:</strong> {html.escape(record.feedback)}</p>\n")
+    parts.append("</section>\n")
+    return ''.join(parts)
+
+
+def _body_html(document):
+    """HTML body of a document, without the page wrapper"""
+    parts = []
+    if document.content_type == "quiz":
+        parts.append("<h1>Quiz Bank</h1>\n")
+        quiz_questions = [record for record in document.records if isinstance(record, QuizQuestionRecord)]
+        parts.extend(_quiz_question_html(idx, record) for idx, record in enumerate(quiz_questions, 1))
+    if document.content_type == "activities":
+        parts.append("<h1>Activity Review</h1>\n")
+        parts.append(_activity_html([record for record in document.records if isinstance(record, ActivityQuestionRecord)]))
+    for record in document.records:
+        if isinstance(record, LessonRecord):
+            parts.append("<h1>Lesson</h1>\n")
+            if record.title is not None:
+                parts.append(f"<h2>{html.escape(record.title)}</h2>\n")
+            if record.paragraphs is None:
+                parts.append("<p><em>No content available</em></p>\n")
+            else:
+                parts.append(_paragraphs_html(record.paragraphs))
+        elif isinstance(record, WalkthroughRecord):
+            parts.append("<h1>Walkthrough Review</h1>\n<h2>Walkthrough Question</h2>\n")
+            parts.append(_activity_html(record.questions))
+            parts.append("<h2>Educational Content</h2>\n")
+            parts.append(_paragraphs_html(record.paragraphs))
+    return ''.join(parts)
+
+
+def render_html(document):
+    """Render a document as a standalone HTML page"""
+    title = html.escape(document.lesson or document.content_type)
+    return ("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{title}</title>\n</head>\n<body>\n{_body_html(document)}</body>\n</html>\n")
+
+
+def render_json(document):
+    """Render a document as a single JSON object"""
+    return json.dumps(document.to_dict(), indent=2, ensure_ascii=False) + '\n'
+
+
+# Output format name -> (file extension, renderer)
+RENDERERS = {
+    'md': ('md', render_markdown),
+    'html': ('html', render_html),
+    'json': ('json', render_json),
+}
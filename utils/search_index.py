@@ -0,0 +1,327 @@
+import heapq
+import json
+import math
+import mmap
+import os
+import threading
+import time
+from array import array
+from collections import Counter
+from .background_writer import write_file_atomic
+from .quiz_export import QUIZ_BANK_FILENAME, load_document
+from .quiz_matcher import normalize_text
+from .renderers import render_markdown
+
+
+def _tokenize(text):
+    return normalize_text(text).split()
+
+
+def _indexable(name):
+    """Markdown files and chapter quiz banks, but not the views exported from a bank"""
+    if name.startswith('.'):
+        return False
+    if name == QUIZ_BANK_FILENAME:
+        return True
+    return name.endswith(".md") and os.path.splitext(name)[0] != "quiz_bank"
+
+
+def _read_text(path):
+    if os.path.basename(path) == QUIZ_BANK_FILENAME:
+        return render_markdown(load_document(path))
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def _locate(rel):
+    """(chapter, content type, lesson) from content/<chapter>/<type>/<number>_<lesson>.md"""
+    parts = rel.split(os.sep)
+    stem = os.path.splitext(parts[-1])[0]
+    if parts[-1] == QUIZ_BANK_FILENAME:
+        lesson = "Quiz bank"
+    else:
+        lesson = stem.split('_', 1)[1] if '_' in stem else stem
+    if len(parts) >= 3:
+        return parts[0], parts[1], lesson
+    return None, parts[0] if len(parts) == 2 else None, lesson
+
+
+class SearchJournal:
+    """Append-only list of files saved since the search index was last updated"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def add(self, filepath):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(os.path.abspath(filepath) + '\n')
+
+    def read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return [line.strip() for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def discard(self, paths):
+        """Drop indexed paths, keeping anything journalled since they were read"""
+        with self._lock:
+            indexed = set(paths)
+            remaining = [path for path in self.read() if path not in indexed]
+            if remaining:
+                write_file_atomic(self.path, ''.join(path + '\n' for path in remaining))
+            elif os.path.exists(self.path):
+                os.remove(self.path)
+
+
+class SearchIndex:
+    """BM25-ranked inverted index over the markdown files and chapter quiz banks under content/.
+
+    The main segment is memory-mapped at query time and never parsed: postings.bin, a
+    flat uint32 array of (doc id, term frequency) pairs; lexicon.bin, sorted uint32
+    (term offset, term length, postings offset, count) entries over the term bytes in
+    terms.bin, binary searched per query term; and lengths.bin, each document's length.
+    paths.txt is only read to name the hits, docs.json (mtime/size per document) only by
+    update(). Files saved or changed since then go into a small delta segment
+    (delta.json) holding their term counts, which masks their old main entries. Once the
+    delta grows past merge_ratio of the corpus it is merged into a rewritten main segment.
+    """
+
+    def __init__(self, index_dir, content_dir, k1=1.2, b=0.75, merge_ratio=0.1, min_merge=200):
+        self.index_dir = index_dir
+        self.content_dir = content_dir
+        self.k1 = k1
+        self.b = b
+        self.merge_ratio = merge_ratio
+        self.min_merge = min_merge
+        self.journal = SearchJournal(os.path.join(index_dir, "pending.txt"))
+        self._opened = False
+        self._maps = []
+        self._views = []
+        self._paths = None
+        self._delta = None
+
+    def pending(self):
+        """Whether saved files or a missing main segment are waiting for update()"""
+        return bool(self.journal.read()) or (os.path.exists(os.path.join(self.index_dir, "docs.json"))
+                                             and not os.path.exists(os.path.join(self.index_dir, "lexicon.bin")))
+
+    def update(self, full=False, journal_only=False):
+        """Bring the index up to date with content/, returns a dict of update statistics.
+
+        With journal_only, only the files in the journal are read and content/ isn't walked.
+        """
+        start = time.monotonic()
+        docs = self._read_json("docs.json", {"paths": [], "stats": []})
+        delta = {"docs": {}, "deleted": []} if full else self._read_json("delta.json", {"docs": {}, "deleted": []})
+        pending = self.journal.read()
+        pending_rel = {os.path.relpath(path, self.content_dir) for path in pending}
+
+        indexed = {} if full else dict(zip(docs["paths"], docs["stats"]))
+        for rel, entry in delta["docs"].items():
+            indexed[rel] = [entry["mtime_ns"], entry["size"]]
+        deleted = set(delta["deleted"])
+
+        if journal_only and not full:
+            current = {}
+            for rel in pending_rel:
+                path = os.path.join(self.content_dir, rel)
+                if _indexable(os.path.basename(rel)) and os.path.exists(path):
+                    stat = os.stat(path)
+                    current[rel] = [stat.st_mtime_ns, stat.st_size]
+            changed = list(current)
+            candidates = [rel for rel in pending_rel if rel not in current and rel in indexed]
+        else:
+            current = {}
+            for root, _, names in os.walk(self.content_dir):
+                for name in names:
+                    if _indexable(name):
+                        path = os.path.join(root, name)
+                        stat = os.stat(path)
+                        current[os.path.relpath(path, self.content_dir)] = [stat.st_mtime_ns, stat.st_size]
+            changed = [rel for rel, stat in current.items() if rel in pending_rel or indexed.get(rel) != stat]
+            candidates = [rel for rel in indexed if rel not in current]
+        # Anything still in the delta is live even if its main-segment entry is masked
+        removed = [rel for rel in candidates if rel in delta["docs"] or rel not in deleted]
+
+        for rel in changed:
+            tokens = _tokenize(_read_text(os.path.join(self.content_dir, rel)))
+            mtime_ns, size = current[rel]
+            delta["docs"][rel] = {"mtime_ns": mtime_ns, "size": size, "length": len(tokens), "terms": Counter(tokens)}
+        for rel in removed:
+            delta["docs"].pop(rel, None)
+        main_paths = set(docs["paths"])
+        deleted.update(rel for rel in changed + removed if rel in main_paths)
+        documents = len((main_paths - deleted) | set(delta["docs"]))
+
+        merged = False
+        if full or not os.path.exists(os.path.join(self.index_dir, "lexicon.bin")) or \
+                len(delta["docs"]) + len(deleted) > max(self.min_merge, self.merge_ratio * documents):
+            self._merge(delta["docs"], deleted, full)
+            merged = True
+        elif changed or removed:
+            write_file_atomic(os.path.join(self.index_dir, "delta.json"), json.dumps({
+                "docs": delta["docs"],
+                "deleted": sorted(deleted),
+                "deleted_ids": [doc_id for doc_id, rel in enumerate(docs["paths"]) if rel in deleted]
+            }))
+        # Files still queued in a background writer stay pending for the next update
+        self.journal.discard([path for path in pending
+                              if os.path.exists(path) or os.path.relpath(path, self.content_dir) in removed])
+        return {"documents": documents, "read": len(changed), "removed": len(removed), "merged": merged,
+                "seconds": time.monotonic() - start}
+
+    def search(self, query, limit=10):
+        """Return up to limit hits for query, best first, as dicts with score, path, chapter and lesson"""
+        self._open()
+        lengths = self._lengths
+        delta_docs = self._delta["docs"]
+        masked = self._masked
+        total = len(lengths) - len(masked) + len(delta_docs)
+        if not total:
+            return []
+        total_length = (sum(lengths) - sum(lengths[doc_id] for doc_id in masked)
+                        + sum(entry["length"] for entry in delta_docs.values()))
+        average = total_length / total or 1
+
+        # Main-segment hits are keyed by doc id, delta hits by path
+        scores = Counter()
+        for term in set(_tokenize(query)):
+            offset, count = self._lookup(term)
+            delta_matches = [(rel, entry["terms"][term], entry["length"])
+                             for rel, entry in delta_docs.items() if term in entry["terms"]]
+            pairs = self._postings[offset * 2:(offset + count) * 2]
+            matches = [(doc_id, frequency, lengths[doc_id])
+                       for doc_id, frequency in zip(pairs[0::2], pairs[1::2]) if doc_id not in masked]
+            matches += delta_matches
+            if not matches:
+                continue
+            idf = math.log(1 + (total - len(matches) + 0.5) / (len(matches) + 0.5))
+            for key, frequency, length in matches:
+                norm = self.k1 * (1 - self.b + self.b * length / average)
+                scores[key] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        hits = []
+        for key, score in heapq.nlargest(limit, scores.items(), key=lambda item: item[1]):
+            rel = self._path(key) if isinstance(key, int) else key
+            chapter, content_type, lesson = _locate(rel)
+            hits.append({"score": score, "path": os.path.join(self.content_dir, rel), "chapter": chapter,
+                         "content_type": content_type, "lesson": lesson})
+        return hits
+
+    def close(self):
+        # Casts before the views they were made from, or the mmaps can't close
+        for view in reversed(self._views):
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._views, self._maps = [], []
+        self._opened = False
+
+    def _merge(self, delta_docs, deleted, full=False):
+        """Fold the delta into forward.json and rewrite the main segment from it"""
+        forward = {} if full else self._read_json("forward.json", {})
+        for rel in deleted:
+            forward.pop(rel, None)
+        forward.update(delta_docs)
+
+        paths = sorted(forward)
+        postings = {}
+        for doc_id, rel in enumerate(paths):
+            for term, frequency in forward[rel]["terms"].items():
+                postings.setdefault(term.encode('utf-8'), []).append((doc_id, frequency))
+
+        flat = array('I')
+        lexicon = array('I')
+        terms = bytearray()
+        # Sorted by UTF-8 bytes, the order _lookup compares in
+        for term in sorted(postings):
+            lexicon.extend((len(terms), len(term), len(flat) // 2, len(postings[term])))
+            terms += term
+            for pair in postings[term]:
+                flat.extend(pair)
+
+        os.makedirs(self.index_dir, exist_ok=True)
+        self._write_binary("postings.bin", flat.tobytes())
+        self._write_binary("lexicon.bin", lexicon.tobytes())
+        self._write_binary("terms.bin", bytes(terms))
+        self._write_binary("lengths.bin", array('I', (forward[rel]["length"] for rel in paths)).tobytes())
+        write_file_atomic(os.path.join(self.index_dir, "paths.txt"), ''.join(rel + '\n' for rel in paths))
+        write_file_atomic(os.path.join(self.index_dir, "docs.json"), json.dumps({
+            "paths": paths,
+            "stats": [[forward[rel]["mtime_ns"], forward[rel]["size"]] for rel in paths],
+        }))
+        write_file_atomic(os.path.join(self.index_dir, "forward.json"), json.dumps(forward))
+        write_file_atomic(os.path.join(self.index_dir, "delta.json"),
+                          json.dumps({"docs": {}, "deleted": [], "deleted_ids": []}))
+        # Left over from the JSON lexicon format
+        if os.path.exists(os.path.join(self.index_dir, "lexicon.json")):
+            os.remove(os.path.join(self.index_dir, "lexicon.json"))
+
+    def _write_binary(self, name, data):
+        temp_path = os.path.join(self.index_dir, name + ".tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, os.path.join(self.index_dir, name))
+
+    def _open(self):
+        if self._opened:
+            return
+        self._postings = self._map("postings.bin", 'I')
+        self._lexicon = self._map("lexicon.bin", 'I')
+        self._terms = self._map("terms.bin")
+        self._lengths = self._map("lengths.bin", 'I')
+        self._delta = self._read_json("delta.json", {"docs": {}, "deleted": [], "deleted_ids": []})
+        # Main-segment documents superseded by the delta or deleted since the last merge
+        self._masked = set(self._delta.get("deleted_ids", []))
+        self._paths = None
+        self._opened = True
+
+    def _map(self, name, fmt=None):
+        """Read-only memoryview over a segment file (cast to fmt if given), empty if it is missing"""
+        path = os.path.join(self.index_dir, name)
+        if not os.path.exists(path) or not os.path.getsize(path):
+            view = memoryview(bytes())
+        else:
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps.append(mapped)
+            view = memoryview(mapped)
+        self._views.append(view)
+        if fmt:
+            view = view.cast(fmt)
+            self._views.append(view)
+        return view
+
+    def _lookup(self, term):
+        """(postings offset, count) of term by binary search over the lexicon, (0, 0) if absent"""
+        key = term.encode('utf-8')
+        lexicon = self._lexicon
+        low, high = 0, len(lexicon) // 4
+        while low < high:
+            middle = (low + high) // 2
+            start = lexicon[middle * 4]
+            candidate = bytes(self._terms[start:start + lexicon[middle * 4 + 1]])
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                return lexicon[middle * 4 + 2], lexicon[middle * 4 + 3]
+        return 0, 0
+
+    def _path(self, doc_id):
+        if self._paths is None:
+            with open(os.path.join(self.index_dir, "paths.txt"), encoding='utf-8') as f:
+                self._paths = f.read().splitlines()
+        return self._paths[doc_id]
+
+    def _read_json(self, name, default):
+        try:
+            with open(os.path.join(self.index_dir, name), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return default
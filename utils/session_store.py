@@ -0,0 +1,51 @@
+import json
+import os
+import time
+from .background_writer import write_file_atomic
+
+
+class SessionStore:
+    """Saves and restores the authenticated browser session (cookies and localStorage).
+
+    The file holds live session tokens, so it is written readable by the owner only.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def save(self, driver):
+        """Save the current page's cookies and localStorage"""
+        data = {
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script("return Object.assign({}, window.localStorage);"),
+            "saved_at": time.time()
+        }
+        write_file_atomic(self.path, json.dumps(data))
+        os.chmod(self.path, 0o600)
+        print(f"Saved session to {self.path}")
+
+    def restore(self, driver, origin_url):
+        """Load the saved session into the browser, returns False if there is nothing to restore"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        # Cookies and localStorage can only be set for the origin currently loaded
+        driver.get(origin_url)
+        for cookie in data.get("cookies", []):
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                print(f"Could not restore cookie {cookie.get('name')}: {e}")
+        driver.execute_script(
+            "for (const [key, value] of Object.entries(arguments[0])) { window.localStorage.setItem(key, value); }",
+            data.get("local_storage", {})
+        )
+        return True
+
+    def clear(self):
+        """Remove the saved session"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,79 @@
+import hashlib
+from collections import Counter
+
+# What a section looks like once ready: URL, amount of text and elements, and the visible headings
+# and question labels. Two sections in a row with the same fingerprint means no progress was made.
+_FINGERPRINT_SCRIPT = """
+const body = document.body;
+return [
+    location.href,
+    body ? body.innerText.length : 0,
+    document.getElementsByTagName('*').length,
+    Array.from(document.querySelectorAll('h1, label.pb-2.form-label')).map((el) => el.innerText.trim()).join('|')
+];
+"""
+
+
+class StallDetector:
+    """Spots sections that make no progress and picks the next recovery step.
+
+    Each section is fingerprinted once it is ready. A section that made no progress (nothing
+    saved, answered or advanced) and has the same fingerprint as the one before it is a
+    stall; a quiz revisited for another attempt is not. Consecutive stalls escalate
+    through RECOVERY_STEPS and then give up. Sections over section_budget count towards lost time, as does the
+    whole of every stalled section and the time spent recovering. phase_budget bounds
+    the handlers' own loops.
+    """
+
+    RECOVERY_STEPS = ("reload", "resume", "recycle")
+
+    def __init__(self, section_budget=1200, phase_budget=300):
+        self.section_budget = section_budget
+        self.phase_budget = phase_budget
+        self.stalls = 0
+        self.recoveries = Counter()
+        self.over_budget = 0
+        self.lost_seconds = 0.0
+        self._previous = None
+        self._consecutive = 0
+
+    def fingerprint(self, driver):
+        """Fingerprint of the current page, or None if it can't be read"""
+        try:
+            values = driver.execute_script(_FINGERPRINT_SCRIPT)
+        except Exception:
+            return None
+        return hashlib.sha1(repr(values).encode('utf-8')).hexdigest()
+
+    def observe(self, fingerprint, elapsed, progressed=False):
+        """Record a finished section, returns the recovery step to take, 'give_up', or None"""
+        if elapsed > self.section_budget:
+            self.over_budget += 1
+            print(f"Section took {elapsed:.0f}s, over its {self.section_budget}s budget")
+
+        stalled = not progressed and fingerprint is not None and fingerprint == self._previous
+        self._previous = fingerprint
+        if not stalled:
+            self._consecutive = 0
+            self.lost_seconds += max(0.0, elapsed - self.section_budget)
+            return None
+
+        self.stalls += 1
+        self.lost_seconds += elapsed
+        self._consecutive += 1
+        if self._consecutive > len(self.RECOVERY_STEPS):
+            return "give_up"
+        step = self.RECOVERY_STEPS[self._consecutive - 1]
+        self.recoveries[step] += 1
+        return step
+
+    def recovered(self, seconds):
+        """Count time spent recovering as lost"""
+        self.lost_seconds += seconds
+
+    def summary(self):
+        """One-line summary of stalls and lost time"""
+        steps = ', '.join(f"{self.recoveries[step]} {step}" for step in self.RECOVERY_STEPS if self.recoveries[step])
+        return (f"Stalls: {self.stalls}{f' ({steps})' if steps else ''}, "
+                f"{self.over_budget} sections over the {self.section_budget}s budget, "
+                f"{self.lost_seconds:.1f}s lost")
@@ -0,0 +1,229 @@
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .background_writer import write_file_atomic
+from .quiz_export import load_document
+from .records import Document, QuizQuestionRecord, record_from_dict, record_to_dict
+from .renderers import render_markdown
+
+# Sections of a chapter study guide, in order, with their headings
+CONTENT_SECTIONS = [
+    ("lessons", "Lessons"),
+    ("activities", "Activities"),
+    ("walkthroughs", "Walkthroughs"),
+    ("quiz", "Quiz Bank"),
+    ("infographics", "Infographics"),
+]
+_SECTION_TYPES = {content_type for content_type, _ in CONTENT_SECTIONS}
+
+# Title used for files saved without a chapter (content/<type>/...)
+UNCATEGORIZED = "Uncategorized"
+
+_HEADING = re.compile(r'^(#{1,6}) ', re.MULTILINE)
+
+
+def _natural_key(name):
+    """Sort key that orders '10_x' after '9_x'"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+
+def _shift_headings(markdown, levels):
+    return _HEADING.sub(lambda match: '#' * min(6, len(match.group(1)) + levels) + ' ', markdown)
+
+
+def _compile_fragment(path, kind):
+    """Read one source file and return (digest, fragment); runs in worker processes for large builds.
+
+    Quiz records are kept as records so questions repeated across files can be merged per chapter,
+    everything else is rendered to markdown with headings shifted under the chapter's sections.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha1(data).hexdigest()
+    if kind == "attachment":
+        return digest, {"attachment": True}
+
+    if kind == "records":
+        document = load_document(path)
+        if document.content_type == "quiz":
+            return digest, {"quiz": [record_to_dict(record) for record in document.records]}
+        text = render_markdown(document)
+    else:
+        text = data.decode('utf-8')
+    return digest, {"markdown": _shift_headings(text, 2)}
+
+
+class StudyGuideCompiler:
+    """Merges content/<chapter>/<type>/ files into one study guide per chapter plus an index.
+
+    Builds are incremental: every source file's mtime, size, hash and compiled fragment are
+    cached, so only new or changed files are read again and only chapters whose sources
+    changed are rewritten. Large rebuilds compile fragments in a process pool.
+    """
+
+    def __init__(self, content_dir, output_dir, cache_path, workers=None, pool_threshold=64):
+        self.content_dir = content_dir
+        self.output_dir = output_dir
+        self.cache_path = cache_path
+        self.workers = workers
+        # Below this many changed files a process pool costs more to start than it saves
+        self.pool_threshold = pool_threshold
+
+    def build(self, full=False):
+        """Compile the study guides, returns a dict of build statistics"""
+        start = time.monotonic()
+        cache = {"files": {}, "chapters": {}} if full else self._load_cache()
+        sources = self._scan()
+
+        files = {}
+        changed = []
+        for rel, (kind, stat) in sources.items():
+            cached = cache["files"].get(rel)
+            if cached and cached["kind"] == kind and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                files[rel] = cached
+            else:
+                changed.append((rel, kind, stat))
+
+        compiled = self._compile([(os.path.join(self.content_dir, rel), kind) for rel, kind, _ in changed])
+        modified = 0
+        for (rel, kind, stat), (digest, fragment) in zip(changed, compiled):
+            cached = cache["files"].get(rel)
+            if not cached or cached["digest"] != digest:
+                modified += 1
+            files[rel] = {"kind": kind, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                          "digest": digest, "fragment": fragment}
+
+        chapters = {}
+        for rel in files:
+            chapter, content_type = self._locate(rel)
+            chapters.setdefault(chapter, {}).setdefault(content_type, []).append(rel)
+
+        written = 0
+        signatures = {}
+        for chapter, sections in chapters.items():
+            for rels in sections.values():
+                rels.sort(key=lambda rel: _natural_key(os.path.basename(rel)))
+            signature = hashlib.sha1(json.dumps(
+                [[rel, files[rel]["digest"]] for content_type, _ in CONTENT_SECTIONS for rel in sections.get(content_type, [])]
+            ).encode('utf-8')).hexdigest()
+            signatures[chapter] = signature
+            output_path = os.path.join(self.output_dir, f"{chapter}.md")
+            if cache["chapters"].get(chapter) != signature or not os.path.exists(output_path):
+                write_file_atomic(output_path, self._chapter_markdown(chapter, sections, files))
+                written += 1
+
+        removed = 0
+        for chapter in set(cache["chapters"]) - set(chapters):
+            try:
+                os.remove(os.path.join(self.output_dir, f"{chapter}.md"))
+                removed += 1
+            except FileNotFoundError:
+                pass
+
+        index_path = os.path.join(self.output_dir, "index.md")
+        if written or removed or not os.path.exists(index_path):
+            write_file_atomic(index_path, self._index_markdown(chapters))
+
+        if changed or removed or len(files) != len(cache["files"]) or signatures != cache["chapters"]:
+            write_file_atomic(self.cache_path, json.dumps({"files": files, "chapters": signatures}))
+        return {
+            "sources": len(files),
+            "read": len(changed),
+            "modified": modified,
+            "chapters_written": written,
+            "chapters_removed": removed,
+            "seconds": time.monotonic() - start,
+        }
+
+    def _scan(self):
+        """Map every source file (relative path) to its kind and stat result"""
+        sources = {}
+        if not os.path.isdir(self.content_dir):
+            return sources
+        for root, dirs, names in os.walk(self.content_dir):
+            dirs.sort()
+            names = set(names)
+            for name in names:
+                if name.startswith('.'):
+                    continue
+                stem, extension = os.path.splitext(name)
+                if extension == ".jsonl":
+                    kind = "records"
+                elif extension == ".md" and f"{stem}.jsonl" not in names:
+                    # Markdown saved before records were, the JSONL is the source when both exist
+                    kind = "markdown"
+                elif extension == ".pdf":
+                    kind = "attachment"
+                else:
+                    continue
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, self.content_dir)
+                if self._locate(rel)[1] in _SECTION_TYPES:
+                    sources[rel] = (kind, os.stat(path))
+        return sources
+
+    def _locate(self, rel):
+        """(chapter, content type) of a source path relative to content/"""
+        parts = rel.split(os.sep)
+        if len(parts) >= 3:
+            return parts[0], parts[1]
+        return UNCATEGORIZED, parts[0]
+
+    def _compile(self, jobs):
+        if len(jobs) < self.pool_threshold:
+            return [_compile_fragment(path, kind) for path, kind in jobs]
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(_compile_fragment, *zip(*jobs), chunksize=32))
+
+    def _chapter_markdown(self, chapter, sections, files):
+        parts = [f"# {chapter.replace('_', ' ')}\n\n"]
+        for content_type, heading in CONTENT_SECTIONS:
+            rels = sections.get(content_type)
+            if not rels:
+                continue
+            parts.append(f"## {heading}\n\n")
+            if content_type == "quiz":
+                parts.append(self._quiz_markdown([files[rel]["fragment"] for rel in rels]))
+                continue
+            for rel in rels:
+                fragment = files[rel]["fragment"]
+                if "attachment" in fragment:
+                    link = os.path.relpath(os.path.join(self.content_dir, rel), self.output_dir)
+                    parts.append(f"- [{os.path.basename(rel)}]({link.replace(os.sep, '/')})\n")
+                else:
+                    parts.append(fragment["markdown"])
+            parts.append("\n")
+        return ''.join(parts)
+
+    def _quiz_markdown(self, fragments):
+        """Merge quiz banks, each question once with its latest answer"""
+        questions = {}
+        for fragment in fragments:
+            for data in fragment.get("quiz", []):
+                record = record_from_dict(data)
+                questions[record.question] = record
+        if not questions:
+            # Only markdown banks, which are cumulative, so the latest one has everything
+            markdown = [fragment["markdown"] for fragment in fragments if "markdown" in fragment]
+            return markdown[-1] if markdown else ""
+        document = Document("quiz", [record for record in questions.values() if isinstance(record, QuizQuestionRecord)])
+        # Drop the bank's own title, the section heading replaces it
+        return _shift_headings(render_markdown(document).split("\n\n", 1)[1], 1)
+
+    def _index_markdown(self, chapters):
+        lines = ["# Study Guide Index\n\n"]
+        for chapter in sorted(chapters, key=_natural_key):
+            counts = ', '.join(f"{len(chapters[chapter][content_type])} {content_type}"
+                               for content_type, _ in CONTENT_SECTIONS if chapters[chapter].get(content_type))
+            lines.append(f"- [{chapter.replace('_', ' ')}]({chapter}.md): {counts}\n")
+        return ''.join(lines)
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {"files": {}, "chapters": {}}
@@ -0,0 +1,137 @@
+import json
+import os
+import sys
+import time
+from collections import defaultdict, deque
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from .background_writer import write_file_atomic
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class TimingPolicy:
+    """Derives wait timeouts and poll intervals from observed wait durations.
+
+    Durations are kept in rolling windows per operation and course type. Once an
+    operation has min_samples observations its timeout is p99 x margin and its poll
+    interval a fraction of the median, clamped to sane bounds; before that the defaults
+    apply. A wait that times out is recorded at its timeout, so the next timeout backs off
+    by margin instead of staying learned from only the waits that succeeded. The windows
+    are saved to disk so later runs start from what was learned.
+    """
+
+    def __init__(self, path=None, default_timeout=10, default_poll=0.25, margin=3.0,
+                 min_timeout=2, max_timeout=60, window=200, min_samples=20):
+        self.path = path
+        self.default_timeout = default_timeout
+        self.default_poll = default_poll
+        self.margin = margin
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min_samples
+        # Course type of the current section, so e.g. quiz and lesson loads are learned separately
+        self.context = None
+        self.timeouts = defaultdict(int)
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._load()
+
+    def observe(self, operation, seconds):
+        """Record how long a wait for operation actually took"""
+        self._samples[self._key(operation)].append(seconds)
+
+    def timeout(self, operation, default=None):
+        """Timeout for operation: learned p99 x margin, or the default until enough samples exist"""
+        samples = self._samples_for(operation)
+        if samples is None:
+            return default if default is not None else self.default_timeout
+        learned = _percentile(samples, 0.99) * self.margin
+        return min(self.max_timeout, max(self.min_timeout, learned))
+
+    def poll_interval(self, operation):
+        """Poll interval for operation: a quarter of the median wait, between 50ms and 500ms"""
+        samples = self._samples_for(operation)
+        if samples is None:
+            return self.default_poll
+        return min(0.5, max(0.05, _percentile(samples, 0.5) / 4))
+
+    def summary(self):
+        """Table of what has been learned per operation"""
+        lines = [f"{'Operation':<70} {'Samples':>7} {'p50 (s)':>8} {'p99 (s)':>8} {'Timeout':>8} {'Timeouts':>8}"]
+        for key in sorted(self._samples):
+            samples = self._samples[key]
+            if not samples:
+                continue
+            lines.append(f"{key[:70]:<70} {len(samples):>7} {_percentile(samples, 0.5):>8.2f} "
+                         f"{_percentile(samples, 0.99):>8.2f} {self._timeout_for_key(key):>8.1f} "
+                         f"{self.timeouts[key]:>8}")
+        return '\n'.join(lines)
+
+    def save(self):
+        """Persist the sample windows"""
+        if self.path:
+            write_file_atomic(self.path, json.dumps({key: list(samples) for key, samples in self._samples.items()}))
+
+    def _key(self, operation):
+        return f"{self.context}:{operation}" if self.context else operation
+
+    def _samples_for(self, operation):
+        """Samples for operation in the current context, falling back to the context-free key"""
+        for key in (self._key(operation), operation):
+            samples = self._samples.get(key)
+            if samples and len(samples) >= self.min_samples:
+                return samples
+        return None
+
+    def _timeout_for_key(self, key):
+        samples = self._samples[key]
+        if len(samples) < self.min_samples:
+            return self.default_timeout
+        return min(self.max_timeout, max(self.min_timeout, _percentile(samples, 0.99) * self.margin))
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for key, samples in json.load(f).items():
+                    self._samples[key].extend(samples)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Could not load timing policy from {self.path}: {e}")
+
+
+class AdaptiveWait:
+    """Stand-in for WebDriverWait whose timeout and poll interval come from a TimingPolicy.
+
+    The operation name defaults to the calling method, so existing `self.wait.until(...)`
+    calls are learned separately without changes. An explicit timeout always wins over
+    the learned one, for waits where timing out is an expected answer. Waits that time out
+    by design pass expected_timeout=True, so their timeouts aren't learned as slow waits.
+    """
+
+    def __init__(self, driver, policy):
+        self._driver = driver
+        self.policy = policy
+
+    def until(self, method, message='', operation=None, timeout=None, expected_timeout=False):
+        """Wait for method like WebDriverWait.until and record how long it took"""
+        if operation is None:
+            code = sys._getframe(1).f_code
+            operation = getattr(code, 'co_qualname', code.co_name)
+
+        limit = timeout if timeout is not None else self.policy.timeout(operation)
+        wait = WebDriverWait(self._driver, limit, poll_frequency=self.policy.poll_interval(operation))
+        start = time.monotonic()
+        try:
+            result = wait.until(method, message)
+        except TimeoutException:
+            self.policy.timeouts[self.policy._key(operation)] += 1
+            # The real duration is at least the timeout; record it so a slower site raises the limit
+            if timeout is None and not expected_timeout:
+                self.policy.observe(operation, limit)
+            raise
+        self.policy.observe(operation, time.monotonic() - start)
+        return result
@@ -0,0 +1,82 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+
+class Tracer:
+    """Records timed spans as a Chrome trace-event JSON file (open it in Perfetto or chrome://tracing).
+
+    Each event is appended as soon as its span ends. The format allows the closing
+    bracket to be missing, so the trace of a run that crashes is still readable.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._file = open(path, 'w', encoding='utf-8')
+        self._file.write('[\n')
+        self._first = True
+        self._emit({"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0,
+                    "args": {"name": "real_estate_u_killer"}})
+
+    @contextmanager
+    def span(self, name, category, **args):
+        """Time the enclosed block as a complete ('X') event"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._emit({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": self._pid,
+                "tid": threading.get_native_id(),
+                "args": args
+            })
+
+    def close(self):
+        """Terminate the JSON array and close the file"""
+        with self._lock:
+            self._file.write('\n]\n')
+            self._file.close()
+        print(f"Trace written to {self.path}")
+
+    def _emit(self, event):
+        with self._lock:
+            self._file.write(('' if self._first else ',\n') + json.dumps(event))
+            self._file.flush()
+            self._first = False
+
+
+class NullTracer:
+    """Tracer used when tracing is off, spans cost nothing"""
+
+    def span(self, name, category, **args):
+        return nullcontext()
+
+    def close(self):
+        pass
+
+
+NULL_TRACER = NullTracer()
+
+
+def traced(category):
+    """Decorator that records a method call as a span on self.tracer"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.tracer.span(method.__qualname__, category):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
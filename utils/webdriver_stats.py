@@ -0,0 +1,75 @@
+import sys
+import time
+from collections import Counter, defaultdict
+
+
+# Wait helpers poll on behalf of their caller, so their round trips count towards it
+_WAIT_MODULES = (__name__, __package__ + '.timing_policy', __package__ + '.page_readiness')
+
+
+def _caller():
+    """Qualified name of the nearest function outside selenium and the wait helpers that issued the command"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if not module.startswith('selenium') and module not in _WAIT_MODULES:
+            # Lambdas and wait conditions defined inside a method count towards the method
+            return getattr(frame.f_code, 'co_qualname', frame.f_code.co_name).split('.<locals>')[0]
+        frame = frame.f_back
+    return '<unknown>'
+
+
+class CommandStats:
+    """Counts WebDriver round trips and their latency by command and calling method.
+
+    install() wraps the driver's execute(), which every driver call, element call and
+    WebDriverWait poll goes through. Nothing is wrapped when stats are disabled, so the
+    disabled path costs nothing.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self._section = defaultdict(lambda: [0, 0.0])
+        self._run = defaultdict(lambda: [0, 0.0])
+
+    def install(self, driver):
+        """Start counting every command sent through driver"""
+        execute = driver.execute
+
+        def instrumented(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                entry = self._section[(_caller(), driver_command)]
+                entry[0] += 1
+                entry[1] += time.perf_counter() - start
+                self.calls += 1
+
+        driver.execute = instrumented
+
+    def end_section(self, label):
+        """Fold the current section into the run totals and return its summary line"""
+        calls = sum(count for count, _ in self._section.values())
+        seconds = sum(elapsed for _, elapsed in self._section.values())
+        by_caller = Counter()
+        for (caller, command), (count, elapsed) in self._section.items():
+            by_caller[caller] += count
+            run_entry = self._run[(caller, command)]
+            run_entry[0] += count
+            run_entry[1] += elapsed
+        self._section.clear()
+
+        top = ', '.join(f"{caller} {count}" for caller, count in by_caller.most_common(3))
+        return f"[{label}] {calls} WebDriver round trips, {seconds:.2f}s ({top})"
+
+    def table(self):
+        """Run-level table of round trips and latency per calling method and command"""
+        lines = [f"{'Caller':<60} {'Command':<24} {'Calls':>7} {'Total (s)':>10} {'Avg (ms)':>9}"]
+        rows = sorted(self._run.items(), key=lambda item: item[1][1], reverse=True)
+        for (caller, command), (count, elapsed) in rows:
+            lines.append(f"{caller[:60]:<60} {command[:24]:<24} {count:>7} {elapsed:>10.2f} {elapsed / count * 1000:>9.1f}")
+        total_calls = sum(count for count, _ in self._run.values())
+        total_seconds = sum(elapsed for _, elapsed in self._run.values())
+        lines.append(f"{'Total':<60} {'':<24} {total_calls:>7} {total_seconds:>10.2f}")
+        return '\n'.join(lines)
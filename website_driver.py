@@ -2,11 +2,16 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, SessionNotCreatedException
 from dotenv import load_dotenv
 import os
 import time
 import re
+from collections import Counter
 from enum import Enum
+from utils import (AdaptiveWait, BackgroundWriter, BrowserMetrics, Checkpoint, ChromedriverCache, CommandStats,
+                   ContentManifest, DownloadTracker, MemoryWatchdog, NULL_TRACER, PageReadiness, SearchIndex, SessionStore,
+                   SharedChromeService, StallDetector, TimingPolicy, Tracer, apply_lean_network_rules, build_chrome_options, traced)
 from handlers import QuizHandler, LessonHandler, ActivityHandler, WalkthroughHandler, InfographicsHandler 
 
 class CourseType(Enum):
@@ -18,26 +23,112 @@ class CourseType(Enum):
     INFOGRAPHICS = 'infographics'
     INTRODDUCTION = 'introduction'
 
+
+# Collects every signal the page classifier needs in one round trip
+_PAGE_SIGNALS_SCRIPT = """
+const has = (selector) => document.querySelector(selector) !== null;
+return {
+    h1: Array.from(document.querySelectorAll('h1')).map((h1) => h1.innerText.trim()),
+    quiz_info: has('div.quiz__info'),
+    activity_container: has('div.activity-container'),
+    print_button: has('button[data-testid="print__button"]'),
+    download_button: has('button[data-testid="get-file__download-button"]'),
+    pdf_container: has('div.pdf-container'),
+    transcript: has('div.transcript')
+};
+"""
+
+# Page signatures in priority order: (course type, signal name, predicate over the signals)
+_PAGE_RULES = [
+    (CourseType.WALKTHROUGH_QUESTION, 'h1 "Attempt the Question"', lambda s: "Attempt the Question" in s['h1']),
+    (CourseType.INTRODDUCTION, 'h1 "Introduction"', lambda s: "Introduction" in s['h1']),
+    (CourseType.WALKTHROUGH, 'h1 "Question Walkthrough Introduction"', lambda s: "Question Walkthrough Introduction" in s['h1']),
+    (CourseType.ACTIVITY, 'h1 "Activity #<number>"', lambda s: any(re.search(r'^Activity\s+#\d+', h1) for h1 in s['h1'])),
+    (CourseType.QUIZ, 'div.quiz__info', lambda s: s['quiz_info']),
+    (CourseType.ACTIVITY, 'div.activity-container', lambda s: s['activity_container']),
+    (CourseType.INFOGRAPHICS, 'print/download buttons and div.pdf-container',
+     lambda s: s['print_button'] and s['download_button'] and s['pdf_container']),
+    (CourseType.LESSON, 'div.transcript', lambda s: s['transcript']),
+]
+
+
+# Seconds to wait for button.next to exist before giving up on moving to the next section
+_NEXT_BUTTON_PRESENCE_TIMEOUT = 10
+
+
+# div.transcript also renders on walkthrough and infographic pages, sometimes before their own
+# signals, so a transcript-only lesson match must hold this many seconds before it is accepted
+_LESSON_SETTLE = 0.5
+
+
+# Rendered once any of the elements the page classifier looks for is on screen
+_SECTION_CONTENT_SELECTOR = 'h1, div.quiz__info, div.activity-container, div.pdf-container, div.transcript'
+
+
+def _classify_page(signals):
+    """Return (course type of the first matching rule, every matched signal name), or False"""
+    matched = [(course_type, name) for course_type, name, predicate in _PAGE_RULES if predicate(signals)]
+    if not matched:
+        return False
+    return matched[0][0], [name for _, name in matched]
+
+
+def _enabled_next_button(driver):
+    """Return the next button once it no longer has the 'next-disabled' class"""
+    next_button = driver.find_element(By.CSS_SELECTOR, 'button.next')
+    if 'next-disabled' in (next_button.get_attribute('class') or ''):
+        return False
+    return next_button
+
+
 class WebsiteDriver:
-    def __init__(self, username, password):
+    def __init__(self, username, password, next_timeout=300, next_poll_interval=0.25,
+                 classify_timeout=2, cache_course_types=False, background_writes=False,
+                 skip_archived=False, resume_checkpoint=True, checkpoint_every=1,
+                 persist_session=False, lean=False, data_dir=None, instrument=False, trace=False,
+                 started_at=None, memory_limit_mb=768, memory_check_every=10, section_budget=1200,
+                 phase_budget=300):
+        # Startup timings are reported from here, or from process start when main passes it in
+        self.started_at = started_at or time.monotonic()
+        self.time_to_first_section = None
         load_dotenv()
         # Configure Chrome download preferences
         # Get project root directory (same directory as this file)
         script_dir = os.path.dirname(os.path.abspath(__file__))
-        download_dir = os.path.join(script_dir, "saved", "infographics")
+        # saved/ and content/ live under data_dir (the project root unless overridden)
+        self.data_dir = data_dir or script_dir
+        download_dir = os.path.join(self.data_dir, "saved", "infographics")
         os.makedirs(download_dir, exist_ok=True)
 
-        chrome_options = webdriver.ChromeOptions()
-        prefs = {
-            "download.default_directory": download_dir,
-            "download.prompt_for_download": False,
-            "download.directory_upgrade": True,
-            "safebrowsing.enabled": True
-        }
-        chrome_options.add_experimental_option("prefs", prefs)
-
-        self.driver = webdriver.Chrome(options=chrome_options)
         self.download_dir = download_dir
+        self.lean = lean
+        self.metrics = BrowserMetrics("lean" if lean else "default")
+        self.downloads = DownloadTracker(download_dir)
+        # Opt-in WebDriver round-trip accounting
+        self.command_stats = CommandStats() if instrument else None
+        # Wait timeouts and poll intervals learned from observed latencies, kept between runs
+        self.timing = TimingPolicy(os.path.join(self.data_dir, "saved", "timing_policy.json"))
+        # Route change / network idle detection, and the page state the last section was ready in
+        self.readiness = PageReadiness()
+        self.page_state = None
+        # Optional phase tracing, written as Chrome trace-event JSON
+        if trace:
+            trace_name = time.strftime("trace-%Y%m%d-%H%M%S.json")
+            self.tracer = Tracer(os.path.join(self.data_dir, "saved", "traces", trace_name))
+        else:
+            self.tracer = NULL_TRACER
+        # Renderer memory sampled every few sections, recycling the browser above the limit
+        self.watchdog = MemoryWatchdog(os.path.join(self.data_dir, "saved", "memory_log.jsonl"),
+                                       limit_mb=memory_limit_mb, every=memory_check_every)
+        # Sections that make no progress, escalating from a reload to a browser recycle
+        self.stall_detector = StallDetector(section_budget=section_budget, phase_budget=phase_budget)
+        self.section_fingerprint = None
+        self.section_progressed = False
+        # chromedriver path resolved once and cached, and one driver process shared by every browser this run
+        self.chromedriver = ChromedriverCache(os.path.join(self.data_dir, "saved", "chromedriver.json"))
+        self.service = None
+        self._start_browser()
+        self.browser_ready_at = time.monotonic()
         
         if not username or not password:
             if os.getenv('USERNAME') and os.getenv('PASSWORD'):
@@ -47,34 +138,135 @@ class WebsiteDriver:
                 raise ValueError("Username and password must be provided either as arguments or in .env file")
         self.username = username
         self.password = password
-        self.wait = WebDriverWait(self.driver, 10)
         self.url = 'https://courses.realestateu.com/login'
+        self.site_url = 'https://courses.realestateu.com/'
+        self.dashboard_url = self.site_url
+
+        # Traversal position, checkpointed so a restart can go straight back to it
+        self.checkpoint = Checkpoint(os.path.join(self.data_dir, "saved", "checkpoint.json"), every=checkpoint_every)
+        self.resume_checkpoint = resume_checkpoint
+        self.sections_completed = 0
+        self.course_type_counts = Counter()
+
+        # Optionally reuse the authenticated session from an earlier run
+        self.session_store = SessionStore(os.path.join(self.data_dir, "saved", "session.json")) if persist_session else None
+
+        # How long _keep_going waits for the next button to enable, and how often it checks
+        self.next_timeout = next_timeout
+        self.next_poll_interval = next_poll_interval
+        self.next_wait_times = []
+
+        # How long to wait for a recognizable page, and optionally remember the type per route URL
+        self.classify_timeout = classify_timeout
+        self.cache_course_types = cache_course_types
+        self.course_type_cache = {}
+        self.last_page_signals = []
 
         # Initialize handlers
-        self.quiz_handler = QuizHandler(self.driver, self.wait)
-        self.lesson_handler = LessonHandler(self.driver, self.wait)
-        self.activity_handler = ActivityHandler(self.driver, self.wait)
+        self.quiz_handler = QuizHandler(self.driver, self.wait, output_dir=self.data_dir)
+        self.lesson_handler = LessonHandler(self.driver, self.wait, output_dir=self.data_dir)
+        self.activity_handler = ActivityHandler(self.driver, self.wait, output_dir=self.data_dir)
         self.walkthrough_handler = WalkthroughHandler(self.driver, self.wait)
-        self.infographics_handler = InfographicsHandler(self.driver, self.wait, self.download_dir)
+        self.infographics_handler = InfographicsHandler(self.driver, self.wait, self.download_dir, self.downloads,
+                                                        output_dir=self.data_dir)
+
+        # Write output files off the browser thread
+        self.writer = BackgroundWriter() if background_writes else None
+        # Record everything saved, and optionally skip sections archived on earlier runs
+        self.manifest = ContentManifest(os.path.join(self.data_dir, "saved", "manifest.db"))
+        # Journal saved files for the next incremental search index update
+        search_journal = SearchIndex(os.path.join(self.data_dir, "saved", "search_index"),
+                                     os.path.join(self.data_dir, "content")).journal
+        for handler in self._content_handlers():
+            handler.writer = self.writer
+            handler.manifest = self.manifest
+            handler.skip_archived = skip_archived
+            handler.tracer = self.tracer
+            handler.readiness = self.readiness
+            handler.search_journal = search_journal
+            handler.phase_budget = phase_budget
+
+    def _content_handlers(self):
+        return (self.quiz_handler, self.lesson_handler, self.activity_handler, self.infographics_handler)
+
+    def _bind_handlers(self):
+        """Point the handlers at the current driver and wait, keeping their state (e.g. the quiz bank)"""
+        for handler in self._content_handlers() + (self.walkthrough_handler,):
+            handler.driver = self.driver
+            handler.wait = self.wait
+
+    def _start_browser(self):
+        """Launch Chrome with the default or lean profile"""
+        chrome_options = build_chrome_options(self.download_dir, lean=self.lean)
+        if self.service is None:
+            self.service = SharedChromeService(executable_path=self.chromedriver.resolve())
+        try:
+            self.driver = webdriver.Chrome(service=self.service, options=chrome_options)
+        except SessionNotCreatedException:
+            if not self.chromedriver.cached():
+                raise
+            # Most likely Chrome updated past the cached driver, so resolve it again
+            print("Cached chromedriver could not start a session, resolving it again")
+            self.chromedriver.forget()
+            self.service.shutdown()
+            self.service = SharedChromeService(executable_path=self.chromedriver.resolve())
+            self.driver = webdriver.Chrome(service=self.service, options=chrome_options)
+        self.chromedriver.remember(self.service.path)
+        if self.command_stats:
+            self.command_stats.install(self.driver)
+        if self.lean:
+            apply_lean_network_rules(self.driver)
+        self.downloads.enable(self.driver)
+        self.metrics.enable(self.driver)
+        self.readiness.install(self.driver)
+        self.wait = AdaptiveWait(self.driver, self.timing)
 
     def start_studying(self):
         """Start the studying session by navigating to the site"""
         try:
-            self._navigate_to_site()
-            self._login(self.username, self.password)
-            self._begin_resume_course()
+            warm = self._restore_session()
+            if not warm:
+                self._navigate_to_site()
+                self._login(self.username, self.password)
+                if self.session_store:
+                    self.session_store.save(self.driver)
+            logged_in = time.monotonic()
+            if not (self.resume_checkpoint and self._resume_from_checkpoint()):
+                self._begin_resume_course()
+            print(f"{'Warm' if warm else 'Cold'} start: browser ready after {self.browser_ready_at - self.started_at:.1f}s, "
+                  f"logged in after {logged_in - self.started_at:.1f}s, "
+                  f"course opened after {time.monotonic() - self.started_at:.1f}s")
             while True: 
+                section_start = time.monotonic()
                 self._go_through_each_course()
-                time.sleep(3)
+                if not self._check_progress(time.monotonic() - section_start):
+                    break
+                self._check_memory()
         finally:
             self._close()
         
+    @traced('section')
     def _go_through_each_course(self):
         print("Going through a new course...")
+        self.section_fingerprint = None
+        self.section_progressed = False
+        progress_before = self._handler_progress()
         try:
+            self.timing.context = None
+            load_start = time.monotonic()
             self._wait_to_load()
+            self.section_fingerprint = self.stall_detector.fingerprint(self.driver)
+            if self.time_to_first_section is None:
+                self.time_to_first_section = time.monotonic() - self.started_at
+                print(f"Time to first section: {self.time_to_first_section:.1f}s")
+            self._save_checkpoint()
+            # Page events pile up in chromedriver's performance log until read, and only infographics read them
+            self.downloads.discard_events(self.driver)
             course_type = self._determine_course_type()
+            self.metrics.sample(self.driver, time.monotonic() - load_start)
             print(f"Course type determined: {course_type}")
+            self.timing.context = course_type.value
+            self.course_type_counts[course_type.value] += 1
             match course_type:
                 case CourseType.QUIZ:
                     self.quiz_handler.handle()
@@ -94,6 +286,7 @@ class WebsiteDriver:
                     self._keep_going()
                 case _:
                     self._keep_going()
+            self.sections_completed += 1
         except Exception as e:
             print(f"\n{'='*60}")
             print(f"ERROR: Handler failed with exception: {e}")
@@ -104,90 +297,94 @@ class WebsiteDriver:
             except Exception as keep_going_error:
                 print(f"Could not click next button: {keep_going_error}")
                 print("Will retry on next iteration...")
+        finally:
+            if self._handler_progress() != progress_before:
+                self.section_progressed = True
+            if self.command_stats:
+                print(self.command_stats.end_section(f"section {self.sections_completed + 1}"))
                 
         
+    @traced('phase')
     def _keep_going(self):
-        """Check if there is a next button to continue to the next course"""
+        """Wait for the next button to enable, then click it to continue to the next course"""
+        print("Continuing to next section...")
+        start = time.monotonic()
         try:
-            print("Continuing to next section...")
-            resolved = False
-            while not resolved:
-                time.sleep(5)
-                next_button = self.driver.find_element(By.CSS_SELECTOR, 'button.next')
-                # Check if button has 'next-disabled' class
-                if 'next-disabled' in next_button.get_attribute('class'):
-                    continue 
-                next_button.click()
-                resolved = True
-                print("Navigated to next course.")
+            # Fail fast when there is no next button at all (course end, redirect), next_timeout is for enabling
+            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'button.next')),
+                            timeout=_NEXT_BUTTON_PRESENCE_TIMEOUT)
+        except TimeoutException:
+            print("No next button found, ending session.")
+            self.next_wait_times.append(time.monotonic() - start)
+            return
+        try:
+            next_wait = WebDriverWait(
+                self.driver,
+                self.next_timeout,
+                poll_frequency=self.next_poll_interval,
+                ignored_exceptions=[StaleElementReferenceException]
+            )
+            next_button = next_wait.until(_enabled_next_button)
+            next_button.click()
+            self.section_progressed = True
+            print("Navigated to next course.")
+        except TimeoutException:
+            print(f"Next button not enabled after {self.next_timeout}s, ending session.")
         except:
             print("No next button found, ending session.")
+        finally:
+            waited = time.monotonic() - start
+            self.next_wait_times.append(waited)
+            print(f"Waited {waited:.2f}s for next button.")
     
+    @traced('phase')
     def _determine_course_type(self):
-        # Check for h1 elements (any h1)
-        try:
-            time.sleep(2)
-            h1_elements = self.driver.find_elements(By.TAG_NAME, 'h1')
-            for h1_element in h1_elements:
-                h1_text = h1_element.text
-
-                # Check for "Attempt the Question"
-                if h1_text == "Attempt the Question":
-                    return CourseType.WALKTHROUGH_QUESTION
-
-                if h1_text == "Introduction":
-                    return CourseType.INTRODDUCTION
-
-                if h1_text == "Question Walkthrough Introduction":
-                    return CourseType.WALKTHROUGH
-
-                # Check if text matches "Activity #<number>"
-                if re.search(r'^Activity\s+#\d+', h1_text):
-                    return CourseType.ACTIVITY
+        """Classify the current page, waiting only until one of the page signatures appears"""
+        url = self.driver.current_url
+        if self.cache_course_types and url in self.course_type_cache:
+            return self.course_type_cache[url]
 
-        except:
-            pass
-
-        # Check for quiz elements (using the quiz__info class)
-        try:
-            self.driver.find_element(By.CSS_SELECTOR, 'div.quiz__info')
-            return CourseType.QUIZ
-        except:
-            pass
-        
-        # Check for infographics by looking for both print and download buttons
+        last = {"result": False, "lesson_since": None}
 
-        # Check for activity elements
-        try:
-            activity_container = self.driver.find_element(By.CSS_SELECTOR, 'div.activity-container')
-            if activity_container:
-                return CourseType.ACTIVITY
+        def classify(driver):
+            result = last["result"] = _classify_page(driver.execute_script(_PAGE_SIGNALS_SCRIPT))
+            if not result or result[0] != CourseType.LESSON:
+                return result
+            # Only the fallback lesson rule matched, give the more specific signals time to render
+            if last["lesson_since"] is None:
+                last["lesson_since"] = time.monotonic()
+            return result if time.monotonic() - last["lesson_since"] >= _LESSON_SETTLE else False
 
-        except:
-            pass
-            
+        course_type, matched = CourseType.LESSON, []
         try:
-            print_button = self.driver.find_element(By.CSS_SELECTOR, 'button[data-testid="print__button"]')
-            download_button = self.driver.find_element(By.CSS_SELECTOR, 'button[data-testid="get-file__download-button"]')
-            pdf_container = self.driver.find_element(By.CSS_SELECTOR, 'div.pdf-container')
-            
-            if (print_button or download_button or pdf_container):
-                return CourseType.INFOGRAPHICS
-        except:
-            pass
+            course_type, matched = self.wait.until(classify, timeout=self.classify_timeout)
+        except TimeoutException:
+            if last["result"]:
+                course_type, matched = last["result"]
+            else:
+                # Default to educational content
+                print("No page signature matched, defaulting to lesson")
+        self.last_page_signals = matched
+        print(f"Matched page signals: {', '.join(matched) or 'none'}")
 
-        # Default to educational content
-        return CourseType.LESSON
+        if self.cache_course_types:
+            self.course_type_cache[url] = course_type
+        return course_type
 
+    @traced('phase')
     def _wait_to_load(self):
-        """Wait for page to be fully loaded"""
-        self.wait.until(lambda driver: driver.execute_script('return document.readyState') == 'complete')
+        """Wait for the client-side route to move on from the last section and its content to render"""
+        self.page_state = self.readiness.wait_until_ready(
+            self.driver, since=self.page_state, content_selector=_SECTION_CONTENT_SELECTOR
+        )
         print("Page loaded.")
         
+    @traced('phase')
     def _navigate_to_site(self):
         """Navigate to the Real Estate U website"""
         self.driver.get(self.url)
 
+    @traced('phase')
     def _login(self, username, password):
         # Wait for email field and fill it
         email_field = self.wait.until(EC.presence_of_element_located((By.NAME, 'email')))
@@ -203,8 +400,116 @@ class WebsiteDriver:
 
         # Wait for successful login
         self.wait.until(EC.url_changes(self.url))
+        self.dashboard_url = self.driver.current_url
         print("Login successful!")
 
+    @traced('phase')
+    def _restore_session(self):
+        """Restore a saved session and check it is still logged in"""
+        if not self.session_store or not self.session_store.restore(self.driver, self.site_url):
+            return False
+
+        self.driver.get(self.site_url)
+        try:
+            # Logged-in pages show the course list, expired sessions get redirected to the login form
+            self.wait.until(lambda driver: driver.current_url.startswith(self.url) or
+                            driver.find_elements(By.CSS_SELECTOR, 'a.course-button'), expected_timeout=True)
+        except TimeoutException:
+            pass
+        if self.driver.current_url.startswith(self.url) or not self.driver.find_elements(By.CSS_SELECTOR, 'a.course-button'):
+            print("Saved session has expired, logging in again")
+            self.session_store.clear()
+            self.driver.delete_all_cookies()
+            return False
+
+        self.dashboard_url = self.driver.current_url
+        print("Restored saved session!")
+        return True
+
+    def _check_progress(self, elapsed):
+        """Escalate recovery when a section made no progress, returns False to end the run"""
+        step = self.stall_detector.observe(self.section_fingerprint, elapsed, self.section_progressed)
+        if step is None:
+            return True
+        if step == "give_up":
+            print("Still no progress after every recovery step, ending session.")
+            return False
+
+        print(f"No progress since the last section, recovering with a {step}")
+        start = time.monotonic()
+        try:
+            self._recover(step)
+        except Exception as e:
+            print(f"Recovery by {step} failed: {e}")
+        self.stall_detector.recovered(time.monotonic() - start)
+        return True
+
+    @traced('phase')
+    def _recover(self, step):
+        """Reload the page, re-enter the course through the Resume button, or recycle the browser"""
+        match step:
+            case "reload":
+                self.driver.refresh()
+            case "resume":
+                # The checkpoint is the stalled section itself, the site knows where progress stopped
+                self.driver.get(self.dashboard_url)
+                self._begin_resume_course()
+            case "recycle":
+                self._recycle_browser()
+        self.page_state = None
+
+    def _handler_progress(self):
+        return sum(handler.progress for handler in self._content_handlers())
+
+    def _check_memory(self):
+        """Every few sections, recycle the browser if the renderer has grown past the memory limit"""
+        if not self.watchdog.due(self.sections_completed):
+            return
+        if self.watchdog.check(self.driver, self.sections_completed):
+            before = self.watchdog.last_heap_mb
+            reason = f"renderer JS heap {before:.0f}MB over {self.watchdog.limit_mb}MB"
+            print(f"Recycling browser: {reason}")
+            seconds = self._recycle_browser()
+            after = self.watchdog.sample(self.driver, self.sections_completed, event="after_recycle")
+            self.watchdog.record_recycle(self.sections_completed, reason, seconds, before, after)
+
+    @traced('phase')
+    def _recycle_browser(self):
+        """Quit the browser, start a fresh one with the same session and continue at the current URL"""
+        start = time.monotonic()
+        try:
+            url = self.driver.current_url
+        except Exception:
+            # The old browser may have crashed, go back to the last checkpointed section instead
+            url = (self.checkpoint.load() or {}).get("url", self.dashboard_url)
+        # Without --persist-session the session is only kept on disk for the restart
+        store = self.session_store or SessionStore(os.path.join(self.data_dir, "saved", "recycle_session.json"))
+        try:
+            store.save(self.driver)
+        except Exception as e:
+            print(f"Could not save the session before recycling: {e}")
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"Could not quit the old browser cleanly: {e}")
+
+        self._start_browser()
+        self._bind_handlers()
+        store.restore(self.driver, self.site_url)
+        if store is not self.session_store:
+            store.clear()
+        self.driver.get(url)
+        if self.driver.current_url.startswith(self.url):
+            print("Session did not survive the restart, logging in again")
+            self._login(self.username, self.password)
+            self.driver.get(url)
+        self.page_state = None
+        self._wait_for_section()
+        elapsed = time.monotonic() - start
+        print(f"Recycled browser in {elapsed:.1f}s, continuing at {url}")
+        return elapsed
+
+    @traced('phase')
     def _begin_resume_course(self):
         # Wait for and click the Resume button
         resume_button = self.wait.until(
@@ -212,11 +517,67 @@ class WebsiteDriver:
         )
         resume_button.click()
         print("Resumed course!")
-        time.sleep(5)  # Let the user see the course page for a bit
+        self._wait_for_section()
+
+    def _wait_for_section(self):
+        """Wait until a course section with a next button has rendered"""
+        try:
+            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'button.next')), expected_timeout=True)
+            return True
+        except TimeoutException:
+            return False
+
+    @traced('phase')
+    def _resume_from_checkpoint(self):
+        """Navigate straight to the checkpointed section, returns False if it isn't usable"""
+        saved = self.checkpoint.load()
+        if not saved or not saved.get("url", "").startswith(self.site_url) or saved["url"].startswith(self.url):
+            return False
+
+        print(f"Resuming from checkpoint: {saved['url']}")
+        self.driver.get(saved["url"])
+        if self.driver.current_url.startswith(self.url) or not self._wait_for_section():
+            print("Checkpointed section is not available, using the Resume button instead")
+            self.driver.get(self.dashboard_url)
+            return False
+
+        counters = saved.get("counters", {})
+        self.sections_completed = counters.get("sections_completed", 0)
+        self.course_type_counts.update(counters.get("course_types", {}))
+        return True
+
+    def _save_checkpoint(self):
+        """Checkpoint the current section URL and progress counters"""
+        try:
+            self.checkpoint.save(self.driver.current_url, {
+                "sections_completed": self.sections_completed,
+                "course_types": dict(self.course_type_counts)
+            })
+        except Exception as e:
+            print(f"Could not save checkpoint: {e}")
 
     def _close(self):
         """Close the browser"""
+        print(f"Completed {self.sections_completed} sections: {dict(self.course_type_counts)}")
+        print(self.metrics.summary())
+        if self.command_stats:
+            print(self.command_stats.table())
+        self.tracer.close()
+        print(self.timing.summary())
+        print(self.readiness.summary())
+        print(self.watchdog.summary())
+        print(self.stall_detector.summary())
+        self.timing.save()
+        if self.next_wait_times:
+            total = sum(self.next_wait_times)
+            print(f"Waited {total:.1f}s for next buttons across {len(self.next_wait_times)} sections "
+                  f"(avg {total / len(self.next_wait_times):.2f}s, max {max(self.next_wait_times):.2f}s)")
+        if self.writer:
+            self.writer.close()
+        self.downloads.close()
+        self.manifest.close()
+        self.quiz_handler.quiz_bank.close()
         self.driver.quit()
-        pass
+        self.service.shutdown()
         
 